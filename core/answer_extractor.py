@@ -2,15 +2,60 @@
 Optimized answer extraction for large documents with progress tracking
 """
 
+import os
+import sys
 import threading
+import multiprocessing
 import time
 import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Any, Callable, Optional, Generator
 from dataclasses import dataclass
 from core.document_parser import DocumentParser
-from core.llm_client import LLMClient, APIConfig
+from core.llm_client import LLMClient, APIConfig, RequestCancelled
+from core.llm_cache import LLMResultCache
 
-@dataclass
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Rough relative cost of each extraction method, used for time estimates
+_METHOD_COMPLEXITY = {
+    'sentences': 1.0,
+    'paragraphs': 0.8,
+    'lists': 1.2,
+    'definitions': 1.5,
+    'facts': 2.0,
+    'procedures': 1.8
+}
+
+# Patterns used by the candidate quality filter
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_HEADER_CAPS_RE = re.compile(r'[A-Z]{5,}')
+
+# Definition patterns, each paired with a literal every match must contain.
+# The (.+?) prefix makes a pattern retry from every position of a line, so it is
+# only run on text where the cheap literal search finds its keyword.
+_DEFINITION_PATTERNS = tuple(
+    (re.compile(keyword, re.IGNORECASE), re.compile(pattern, re.IGNORECASE))
+    for keyword, pattern in (
+        (r'\sis\s', r'(.+?)\s+is\s+(.+?)[.!?]'),                                  # "X is Y"
+        (r'\sare\s', r'(.+?)\s+are\s+(.+?)[.!?]'),                                # "X are Y"
+        (r'\smeans\s', r'(.+?)\s+means\s+(.+?)[.!?]'),                            # "X means Y"
+        (r'\srefers to\s', r'(.+?)\s+refers to\s+(.+?)[.!?]'),                    # "X refers to Y"
+        (r':\s', r'(.+?):\s+(.+?)[.!?]'),                                          # "X: Y"
+        (r'\scan be defined as\s', r'(.+?)\s+can be defined as\s+(.+?)[.!?]'),    # "X can be defined as Y"
+    )
+)
+
+@lru_cache(maxsize=64)
+def _complexity_factor(methods_key: frozenset) -> float:
+    """Summed complexity of a set of extraction methods"""
+    return sum(_METHOD_COMPLEXITY.get(method, 1.0) for method in methods_key)
+
+@dataclass(**_DATACLASS_SLOTS)
 class AnswerCandidate:
     """Represents a potential answer extracted from text"""
     text: str
@@ -29,14 +74,28 @@ class ExtractionProgress:
     current_method: str
     is_complete: bool = False
     error_message: Optional[str] = None
+    new_candidates: Optional[List['AnswerCandidate']] = None  # Results finished since the last update
+    duplicate_chunks: int = 0  # Chunks whose text repeated an earlier chunk and reused its results
 
 class AnswerExtractor:
     """Enhanced answer extractor for large documents with progress tracking"""
     
+    # Extraction method name -> extractor method
+    EXTRACTION_METHODS = {
+        'sentences': '_extract_sentences',
+        'paragraphs': '_extract_paragraphs',
+        'lists': '_extract_list_items',
+        'definitions': '_extract_definitions',
+        'facts': '_extract_facts',
+        'procedures': '_extract_procedures'
+    }
+    
     def __init__(self):
         self.doc_parser = DocumentParser()
         self.is_extracting = False
-        self.stop_extraction = False
+        self._stop_event = threading.Event()  # Backs stop_extraction; also aborts in-flight AI requests
+        self._worker_conn = None  # Parent end of the pipe to the extraction process
+        self._pipelines = {}  # Compiled extraction pipelines keyed by method tuple
         
         # Base extraction settings
         self.min_answer_length = 20
@@ -47,6 +106,17 @@ class AnswerExtractor:
         self.max_candidates_per_chunk = 100
         self.overlap_size = 200  # Characters to overlap between chunks to catch split sentences
     
+    @property
+    def stop_extraction(self) -> bool:
+        return self._stop_event.is_set()
+    
+    @stop_extraction.setter
+    def stop_extraction(self, value: bool):
+        if value:
+            self._stop_event.set()
+        else:
+            self._stop_event.clear()
+    
     def extract_answers_optimized(self, 
                                 document_data: Dict[str, Any], 
                                 methods: List[str] = None,
@@ -55,7 +125,10 @@ class AnswerExtractor:
                                 chunk_range: Optional[Dict[str, int]] = None,
                                 ai_config: Optional[APIConfig] = None,
                                 ai_max_pairs: int = 25,
-                                ai_custom_prompt: Optional[str] = None) -> List[AnswerCandidate]:
+                                ai_custom_prompt: Optional[str] = None,
+                                ai_parallelism: int = 1,
+                                ai_batch_size: int = 1,
+                                ai_ignore_cache: bool = False) -> List[AnswerCandidate]:
         """Extract answers with optimization for large documents"""
         
         if methods is None:
@@ -66,7 +139,8 @@ class AnswerExtractor:
             if ai_config is None:
                 raise ValueError("AI extraction requires ai_config parameter")
             return self.extract_answers_ai(document_data, progress_callback, max_candidates, chunk_range, 
-                                         ai_config, ai_max_pairs, ai_custom_prompt)
+                                         ai_config, ai_max_pairs, ai_custom_prompt, ai_parallelism, ai_batch_size,
+                                         ai_ignore_cache)
         
         all_candidates = []
         
@@ -101,9 +175,13 @@ class AnswerExtractor:
         
         doc_index = document_data['index']
         all_candidates = []
+        extend_candidates = all_candidates.extend
         
         total_chunks = len(doc_index.chunks)
         
+        # Resolve one pipeline per method up front instead of dispatching per chunk
+        method_pipelines = [(method, self._compile_pipeline([method])) for method in methods]
+        
         for chunk_idx, chunk in enumerate(doc_index.chunks):
             if self.stop_extraction:
                 break
@@ -123,7 +201,7 @@ class AnswerExtractor:
                     chunk_content = prev_content + chunk_content
             
             # Extract from this chunk
-            for method in methods:
+            for method, pipeline in method_pipelines:
                 if self.stop_extraction or len(all_candidates) >= max_candidates:
                     break
                 
@@ -136,13 +214,10 @@ class AnswerExtractor:
                     )
                     progress_callback(progress)
                 
-                chunk_candidates = self._extract_from_chunk(
-                    chunk_content, [method], chunk.char_start
-                )
+                chunk_candidates = pipeline(chunk_content, chunk.char_start)
                 
                 # Limit candidates per chunk to prevent memory issues
-                chunk_candidates = chunk_candidates[:self.max_candidates_per_chunk]
-                all_candidates.extend(chunk_candidates)
+                extend_candidates(chunk_candidates[:self.max_candidates_per_chunk])
         
         # Final deduplication and filtering
         all_candidates = self._deduplicate_candidates(all_candidates)
@@ -162,14 +237,43 @@ class AnswerExtractor:
     
     def _extract_from_chunk(self, content: str, methods: List[str], char_offset: int = 0) -> List[AnswerCandidate]:
         """Extract candidates from a single chunk"""
-        candidates = self.extract_answers(content, methods)
+        return self._compile_pipeline(methods)(content, char_offset)
+    
+    def _compile_pipeline(self, methods: List[str]) -> Callable[[str, int], List[AnswerCandidate]]:
+        """Build (once per method set) a function extracting, filtering and ranking a text"""
+        key = tuple(methods)
+        pipeline = self._pipelines.get(key)
+        if pipeline is not None:
+            return pipeline
+        
+        extractors = tuple(
+            getattr(self, self.EXTRACTION_METHODS[method])
+            for method in key if method in self.EXTRACTION_METHODS
+        )
+        deduplicate = self._deduplicate_candidates
+        filter_candidates = self._filter_candidates
         
-        # Adjust positions to account for chunk offset
-        for candidate in candidates:
-            candidate.start_pos += char_offset
-            candidate.end_pos += char_offset
+        def pipeline(text: str, char_offset: int = 0) -> List[AnswerCandidate]:
+            candidates = []
+            for extract in extractors:
+                candidates.extend(extract(text))
+            
+            # Remove duplicates and apply filters
+            candidates = filter_candidates(deduplicate(candidates))
+            
+            # Sort by confidence score
+            candidates.sort(key=lambda x: x.confidence, reverse=True)
+            
+            # Adjust positions to account for chunk offset
+            if char_offset:
+                for candidate in candidates:
+                    candidate.start_pos += char_offset
+                    candidate.end_pos += char_offset
+            
+            return candidates
         
-        return candidates
+        self._pipelines[key] = pipeline
+        return pipeline
     
     def extract_answers_threaded(self,
                                 document_data: Dict[str, Any],
@@ -181,25 +285,48 @@ class AnswerExtractor:
                                 chunk_range: Optional[Dict[str, int]] = None,
                                 ai_config: Optional[APIConfig] = None,
                                 ai_max_pairs: int = 25,
-                                ai_custom_prompt: Optional[str] = None):
-        """Extract answers in a separate thread"""
+                                ai_custom_prompt: Optional[str] = None,
+                                ai_parallelism: int = 1,
+                                ai_batch_size: int = 1,
+                                ai_ignore_cache: bool = False):
+        """Extract answers in a worker process, relaying its messages from a thread"""
+        
+        self.is_extracting = True
+        self.stop_extraction = False
         
-        def extraction_worker():
+        # Ensure AI parameters have defaults when not provided
+        final_ai_max_pairs = ai_max_pairs if ai_config is not None else 25
+        final_ai_custom_prompt = ai_custom_prompt if ai_config is not None else None
+        
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_extraction_process_main,
+            args=(child_conn, self.get_extraction_settings(), document_data, methods, max_candidates,
+                  chunk_range, ai_config, final_ai_max_pairs, final_ai_custom_prompt, ai_parallelism,
+                  ai_batch_size, ai_ignore_cache),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._worker_conn = parent_conn
+        
+        def relay_worker():
             try:
-                self.is_extracting = True
-                self.stop_extraction = False
-                
-                # Ensure AI parameters have defaults when not provided
-                final_ai_max_pairs = ai_max_pairs if ai_config is not None else 25
-                final_ai_custom_prompt = ai_custom_prompt if ai_config is not None else None
-                
-                candidates = self.extract_answers_optimized(
-                    document_data, methods, progress_callback, max_candidates, chunk_range, 
-                    ai_config, final_ai_max_pairs, final_ai_custom_prompt
-                )
-                
-                if completion_callback:
-                    completion_callback(candidates)
+                while True:
+                    try:
+                        kind, payload = parent_conn.recv()
+                    except EOFError:
+                        raise Exception("Extraction process exited unexpectedly")
+                    
+                    if kind == 'progress':
+                        if progress_callback:
+                            progress_callback(payload)
+                    elif kind == 'complete':
+                        if completion_callback:
+                            completion_callback(payload)
+                        break
+                    elif kind == 'error':
+                        raise Exception(payload)
                     
             except Exception as e:
                 if error_callback:
@@ -216,14 +343,26 @@ class AnswerExtractor:
                     progress_callback(progress)
             finally:
                 self.is_extracting = False
+                self._worker_conn = None
+                parent_conn.close()
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
         
-        thread = threading.Thread(target=extraction_worker, daemon=True)
+        thread = threading.Thread(target=relay_worker, daemon=True)
         thread.start()
         return thread
     
     def stop_current_extraction(self):
         """Stop the current extraction process"""
         self.stop_extraction = True
+        
+        # Ask the worker process to stop after its current step (it returns partial results)
+        if self._worker_conn is not None:
+            try:
+                self._worker_conn.send('stop')
+            except (OSError, ValueError):
+                pass
     
     def extract_answers_generator(self,
                                 document_data: Dict[str, Any],
@@ -276,18 +415,9 @@ class AnswerExtractor:
         
         metadata = document_data.get('metadata', {})
         total_chars = metadata.get('total_characters', 0)
+        methods_key = frozenset(methods)
         
-        # Rough estimates based on method complexity
-        method_complexity = {
-            'sentences': 1.0,
-            'paragraphs': 0.8,
-            'lists': 1.2,
-            'definitions': 1.5,
-            'facts': 2.0,
-            'procedures': 1.8
-        }
-        
-        complexity_factor = sum(method_complexity.get(method, 1.0) for method in methods)
+        complexity_factor = _complexity_factor(methods_key)
         
         # Estimate processing time (very rough)
         chars_per_second = 50000  # Rough estimate
@@ -314,7 +444,7 @@ class AnswerExtractor:
             'complexity_factor': complexity_factor,
             'total_characters': total_chars,
             'uses_lazy_loading': document_data.get('lazy_content', False),
-            'chunk_count': len(document_data.get('index', {}).get('chunks', []))
+            'chunk_count': metadata.get('chunk_count', 0)
         }
     
     def get_extraction_settings(self) -> Dict[str, Any]:
@@ -346,30 +476,7 @@ class AnswerExtractor:
         if methods is None:
             methods = ['sentences', 'paragraphs', 'lists', 'definitions', 'facts']
         
-        candidates = []
-        
-        for method in methods:
-            if method == 'sentences':
-                candidates.extend(self._extract_sentences(text))
-            elif method == 'paragraphs':
-                candidates.extend(self._extract_paragraphs(text))
-            elif method == 'lists':
-                candidates.extend(self._extract_list_items(text))
-            elif method == 'definitions':
-                candidates.extend(self._extract_definitions(text))
-            elif method == 'facts':
-                candidates.extend(self._extract_facts(text))
-            elif method == 'procedures':
-                candidates.extend(self._extract_procedures(text))
-        
-        # Remove duplicates and apply filters
-        candidates = self._deduplicate_candidates(candidates)
-        candidates = self._filter_candidates(candidates)
-        
-        # Sort by confidence score
-        candidates.sort(key=lambda x: x.confidence, reverse=True)
-        
-        return candidates
+        return self._compile_pipeline(methods)(text)
     
     def _extract_sentences(self, text: str) -> List[AnswerCandidate]:
         """Extract individual sentences as answer candidates"""
@@ -488,18 +595,11 @@ class AnswerExtractor:
         """Extract definitions and explanatory statements"""
         candidates = []
         
-        # Patterns for definitions
-        definition_patterns = [
-            r'(.+?)\s+is\s+(.+?)[.!?]',           # "X is Y"
-            r'(.+?)\s+are\s+(.+?)[.!?]',          # "X are Y"
-            r'(.+?)\s+means\s+(.+?)[.!?]',        # "X means Y"
-            r'(.+?)\s+refers to\s+(.+?)[.!?]',    # "X refers to Y"
-            r'(.+?):\s+(.+?)[.!?]',               # "X: Y"
-            r'(.+?)\s+can be defined as\s+(.+?)[.!?]', # "X can be defined as Y"
-        ]
-        
-        for pattern in definition_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for keyword, pattern in _DEFINITION_PATTERNS:
+            if not keyword.search(text):
+                continue
+            
+            matches = pattern.finditer(text)
             
             for match in matches:
                 definition = match.group(0).strip()
@@ -686,11 +786,18 @@ class AnswerExtractor:
         # Sort by position
         candidates.sort(key=lambda x: x.start_pos)
         
-        deduplicated = []
+        # Kept candidates in insertion order (dict gives O(1) removal), plus the
+        # subset that can still overlap later ones. Since candidates arrive by
+        # start position, anything ending before the current start never can.
+        deduplicated = {}
+        active = []
         for candidate in candidates:
+            if active:
+                active = [existing for existing in active if existing.end_pos > candidate.start_pos]
+            
             # Check for overlaps with existing candidates
             overlap_found = False
-            for existing in deduplicated:
+            for existing in active:
                 # Check if there's significant overlap
                 overlap_start = max(candidate.start_pos, existing.start_pos)
                 overlap_end = min(candidate.end_pos, existing.end_pos)
@@ -703,37 +810,52 @@ class AnswerExtractor:
                     overlap_found = True
                     # Keep the one with higher confidence
                     if candidate.confidence > existing.confidence:
-                        deduplicated.remove(existing)
-                        deduplicated.append(candidate)
+                        del deduplicated[id(existing)]
+                        active.remove(existing)
+                        deduplicated[id(candidate)] = candidate
+                        active.append(candidate)
                     break
             
             if not overlap_found:
-                deduplicated.append(candidate)
-        
-        return deduplicated
+                deduplicated[id(candidate)] = candidate
+                active.append(candidate)
+        
+        # Drop repeats of the same text found at other positions, keeping the first
+        unique = []
+        seen_texts = set()
+        for candidate in deduplicated.values():
+            text_key = ' '.join(candidate.text.split()).lower()
+            if text_key not in seen_texts:
+                seen_texts.add(text_key)
+                unique.append(candidate)
+        
+        return unique
     
     def _filter_candidates(self, candidates: List[AnswerCandidate]) -> List[AnswerCandidate]:
         """Filter candidates based on quality criteria"""
         filtered = []
+        min_confidence = self.min_confidence
+        min_length = self.min_answer_length
+        max_length = self.max_answer_length
+        min_clean_length = min_length * 0.7
         
         for candidate in candidates:
+            text = candidate.text
+            
             # Apply filters
-            if candidate.confidence < self.min_confidence:
+            if candidate.confidence < min_confidence:
                 continue
             
-            if len(candidate.text) < self.min_answer_length:
-                continue
-                
-            if len(candidate.text) > self.max_answer_length:
+            if not min_length <= len(text) <= max_length:
                 continue
             
             # Filter out candidates that are mostly punctuation or whitespace
-            clean_text = re.sub(r'[^\w\s]', '', candidate.text)
-            if len(clean_text.strip()) < self.min_answer_length * 0.7:
+            clean_text = _PUNCTUATION_RE.sub('', text)
+            if len(clean_text.strip()) < min_clean_length:
                 continue
             
             # Filter out candidates with too many consecutive capitals (likely headers)
-            if re.search(r'[A-Z]{5,}', candidate.text):
+            if _HEADER_CAPS_RE.search(text):
                 continue
             
             filtered.append(candidate)
@@ -756,13 +878,17 @@ class AnswerExtractor:
                           chunk_range: Optional[Dict[str, int]] = None,
                           ai_config: Optional[APIConfig] = None,
                           ai_max_pairs: int = 25,
-                          ai_custom_prompt: Optional[str] = None) -> List[AnswerCandidate]:
+                          ai_custom_prompt: Optional[str] = None,
+                          ai_parallelism: int = 1,
+                          ai_batch_size: int = 1,
+                          ai_ignore_cache: bool = False) -> List[AnswerCandidate]:
         """Extract Q&A pairs using AI and return as answer candidates"""
         
         # Use provided AI configuration or load from file
         try:
             if ai_config:
-                llm_client = LLMClient(ai_config)
+                llm_client = LLMClient(ai_config, stop_event=self._stop_event,
+                                       max_connections=max(1, ai_parallelism))
             else:
                 import json
                 import os
@@ -777,7 +903,8 @@ class AnswerExtractor:
                     model=api_config_data['model']
                 )
                 
-                llm_client = LLMClient(config)
+                llm_client = LLMClient(config, stop_event=self._stop_event,
+                                       max_connections=max(1, ai_parallelism))
             
         except Exception as e:
             if progress_callback:
@@ -792,67 +919,110 @@ class AnswerExtractor:
                 progress_callback(progress)
             return []
         
+        # Results of earlier runs, keyed by the model settings and prompt each request sends
+        try:
+            cache = LLMResultCache()
+        except Exception as e:
+            print(f"AI result cache unavailable: {e}")
+            cache = None
+        
+        def extract_segments(segments: List[str]) -> List[List[Dict[str, str]]]:
+            return self._extract_qa_cached(llm_client, cache, segments, ai_max_pairs,
+                                           ai_custom_prompt, ai_ignore_cache)
+        
         all_candidates = []
         
-        # Check if document uses lazy loading
-        if document_data.get('lazy_content', False):
-            all_candidates = self._extract_ai_from_lazy_document(
-                document_data, llm_client, progress_callback, max_candidates, chunk_range,
-                ai_max_pairs, ai_custom_prompt
-            )
-        else:
-            # Process entire document at once for small documents
-            content = document_data.get('content', '')
-            if content:
-                try:
-                    if progress_callback:
-                        progress = ExtractionProgress(
-                            current_chunk=1,
-                            total_chunks=1,
-                            candidates_found=0,
-                            current_method='ai'
-                        )
-                        progress_callback(progress)
-                    
-                    qa_pairs = llm_client.extract_qa_pairs_from_text(content, max_pairs=ai_max_pairs, custom_prompt=ai_custom_prompt)
-                    all_candidates = self._convert_qa_pairs_to_candidates(qa_pairs, content)
-                    
-                    if progress_callback:
-                        progress = ExtractionProgress(
-                            current_chunk=1,
-                            total_chunks=1,
-                            candidates_found=len(all_candidates),
-                            current_method='ai',
-                            is_complete=True
-                        )
-                        progress_callback(progress)
+        try:
+            # Check if document uses lazy loading
+            if document_data.get('lazy_content', False):
+                all_candidates = self._extract_ai_from_lazy_document(
+                    document_data, extract_segments, progress_callback, max_candidates, chunk_range,
+                    ai_parallelism, ai_batch_size
+                )
+            else:
+                # Process entire document at once for small documents
+                content = document_data.get('content', '')
+                if content:
+                    try:
+                        if progress_callback:
+                            progress = ExtractionProgress(
+                                current_chunk=1,
+                                total_chunks=1,
+                                candidates_found=0,
+                                current_method='ai'
+                            )
+                            progress_callback(progress)
                         
-                except Exception as e:
-                    if progress_callback:
-                        progress = ExtractionProgress(
-                            current_chunk=1,
-                            total_chunks=1,
-                            candidates_found=0,
-                            current_method='ai',
-                            is_complete=True,
-                            error_message=str(e)
-                        )
-                        progress_callback(progress)
+                        qa_pairs = extract_segments([content])[0]
+                        all_candidates = self._convert_qa_pairs_to_candidates(qa_pairs, content)
+                        
+                        if progress_callback:
+                            progress = ExtractionProgress(
+                                current_chunk=1,
+                                total_chunks=1,
+                                candidates_found=len(all_candidates),
+                                current_method='ai',
+                                is_complete=True
+                            )
+                            progress_callback(progress)
+                            
+                    except Exception as e:
+                        if progress_callback:
+                            progress = ExtractionProgress(
+                                current_chunk=1,
+                                total_chunks=1,
+                                candidates_found=0,
+                                current_method='ai',
+                                is_complete=True,
+                                error_message=str(e)
+                            )
+                            progress_callback(progress)
+        finally:
+            if cache is not None:
+                cache.close()
         
         return all_candidates[:max_candidates]
     
+    def _extract_qa_cached(self,
+                           llm_client: LLMClient,
+                           cache: Optional[LLMResultCache],
+                           segments: List[str],
+                           max_pairs: int,
+                           custom_prompt: Optional[str],
+                           ignore_cache: bool = False) -> List[List[Dict[str, str]]]:
+        """Extract Q&A pairs per segment, requesting only segments missing from the cache"""
+        if cache is None:
+            return llm_client.extract_qa_pairs_from_segments(segments, max_pairs=max_pairs, custom_prompt=custom_prompt)
+        
+        # Batched replies come from a different prompt, so results are keyed by request size too
+        signatures = [llm_client.qa_request_signature(segment, max_pairs, custom_prompt) for segment in segments]
+        results = [None if ignore_cache else cache.get(LLMResultCache.make_key(batch_size=len(segments), **signature))
+                   for signature in signatures]
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fetched = llm_client.extract_qa_pairs_from_segments(
+                [segments[i] for i in missing], max_pairs=max_pairs, custom_prompt=custom_prompt
+            )
+            for i, qa_pairs in zip(missing, fetched):
+                results[i] = qa_pairs
+                # Empty results may be a failed request, so only store real answers
+                if qa_pairs:
+                    cache.put(LLMResultCache.make_key(batch_size=len(missing), **signatures[i]), qa_pairs)
+        
+        return results
+    
     def _extract_ai_from_lazy_document(self,
                                      document_data: Dict[str, Any],
-                                     llm_client: LLMClient,
+                                     extract_segments: Callable[[List[str]], List[List[Dict[str, str]]]],
                                      progress_callback: Optional[Callable[[ExtractionProgress], None]],
                                      max_candidates: int,
                                      chunk_range: Optional[Dict[str, int]] = None,
-                                     ai_max_pairs: int = 25,
-                                     ai_custom_prompt: Optional[str] = None) -> List[AnswerCandidate]:
+                                     ai_parallelism: int = 1,
+                                     ai_batch_size: int = 1) -> List[AnswerCandidate]:
         """Extract Q&A pairs from lazy-loaded document using AI"""
         
         doc_index = document_data['index']
-        all_candidates = []
         total_chunks = len(doc_index.chunks)
         
         # Determine chunk range to process
@@ -866,59 +1036,189 @@ class AnswerExtractor:
             start_chunk = max(0, min(start_chunk, total_chunks))
             end_chunk = max(start_chunk, min(end_chunk, total_chunks))
         
-        # Process only the specified chunk range
-        chunks_to_process = doc_index.chunks[start_chunk:end_chunk]
+        # Process only the specified chunk range, iterating it in place rather than copying it
+        chunks_to_process = islice(doc_index.chunks, start_chunk, end_chunk)
+        total_progress = end_chunk - start_chunk
+        
+        # Consecutive chunks sent together in one request
+        batch_size = max(1, ai_batch_size)
+        batches = list(iter(lambda: list(islice(chunks_to_process, batch_size)), []))
+        
+        # Chunk text digest -> Q&A pairs, or an Event while the first request for that text is in flight
+        text_results = {}
+        text_lock = threading.Lock()
+        duplicate_chunks = 0
+        
+        def extract_unique_segments(segments: List[str]) -> List[List[Dict[str, str]]]:
+            """Extract Q&A pairs, sending each distinct chunk text (e.g. repeated boilerplate) only once"""
+            nonlocal duplicate_chunks
+            keys = [hashlib.sha1(segment.encode('utf-8')).digest() for segment in segments]
+            results = [None] * len(segments)
+            requested = set()  # Keys this call sent itself
+            
+            while True:
+                # Claim texts nobody holds; the rest wait for the request in flight
+                owned = {}
+                waiting = []
+                with text_lock:
+                    for i, key in enumerate(keys):
+                        if results[i] is not None or key in owned:
+                            continue
+                        value = text_results.get(key)
+                        if value is None:
+                            text_results[key] = threading.Event()
+                            owned[key] = segments[i]
+                        elif isinstance(value, threading.Event):
+                            waiting.append(value)
+                
+                fetched = {}
+                try:
+                    if owned:
+                        fetched = dict(zip(owned, extract_segments(list(owned.values()))))
+                        requested.update(owned)
+                finally:
+                    with text_lock:
+                        for key in owned:
+                            event = text_results.pop(key)
+                            if key in fetched:
+                                text_results[key] = fetched[key]
+                            event.set()  # On failure the key is released for waiters to claim
+                
+                for event in waiting:
+                    event.wait()
+                
+                with text_lock:
+                    for i, key in enumerate(keys):
+                        if results[i] is None and isinstance(text_results.get(key), list):
+                            results[i] = text_results[key]
+                
+                # Loop again only for texts whose owner's request failed
+                if all(result is not None for result in results):
+                    break
+            
+            # Every chunk beyond one per text sent here reused a result
+            with text_lock:
+                duplicate_chunks += len(keys) - len(requested)
+            return results
         
-        for chunk_idx, chunk in enumerate(chunks_to_process, start=start_chunk):
+        def extract_batch(first_chunk_idx: int, batch) -> List[AnswerCandidate]:
+            """Extract candidates from a batch of chunks; errors are logged and skipped"""
             if self.stop_extraction:
-                break
-                
-            if len(all_candidates) >= max_candidates:
-                break
+                return []
             
-            # Load chunk content
-            chunk_content = self.doc_parser.load_chunk(document_data, chunk.chunk_id)
+            # Load chunk content, skipping empty chunks
+            loaded = []
+            for chunk in batch:
+                chunk_content = self.doc_parser.load_chunk(document_data, chunk.chunk_id)
+                if chunk_content.strip():
+                    loaded.append((chunk, chunk_content))
             
-            if not chunk_content.strip():
-                continue
+            if not loaded:
+                return []
             
             try:
-                if progress_callback:
-                    # Report progress relative to the chunk range being processed
-                    current_progress = chunk_idx - start_chunk + 1
-                    total_progress = end_chunk - start_chunk
-                    progress = ExtractionProgress(
-                        current_chunk=current_progress,
-                        total_chunks=total_progress,
-                        candidates_found=len(all_candidates),
-                        current_method='ai'
-                    )
-                    progress_callback(progress)
-                
-                # Extract Q&A pairs from this chunk
-                qa_pairs = llm_client.extract_qa_pairs_from_text(chunk_content, max_pairs=ai_max_pairs, custom_prompt=ai_custom_prompt)
+                # Extract Q&A pairs from these chunks, grouped per chunk
+                grouped_pairs = extract_unique_segments([chunk_content for _, chunk_content in loaded])
                 
                 # Convert Q&A pairs to candidates
-                chunk_candidates = self._convert_qa_pairs_to_candidates(qa_pairs, chunk_content, chunk.char_start)
-                all_candidates.extend(chunk_candidates)
+                batch_candidates = []
+                for (chunk, chunk_content), qa_pairs in zip(loaded, grouped_pairs):
+                    batch_candidates.extend(
+                        self._convert_qa_pairs_to_candidates(qa_pairs, chunk_content, chunk.char_start)
+                    )
+                return batch_candidates
                 
+            except RequestCancelled:
+                return []
             except Exception as e:
-                print(f"Error processing chunk {chunk_idx}: {e}")
+                print(f"Error processing chunk {first_chunk_idx}: {e}")
                 # If it's an API error, add more context
                 if "404" in str(e) or "API request failed" in str(e):
                     print(f"API configuration issue detected. Check your API settings.")
                     # For now, continue with next chunk, but could also abort here
-                continue
+                return []
+        
+        def report_progress(current_progress: int, new_candidates: Optional[List[AnswerCandidate]] = None):
+            if progress_callback:
+                progress = ExtractionProgress(
+                    current_chunk=current_progress,
+                    total_chunks=total_progress,
+                    candidates_found=candidates_found,
+                    current_method='ai',
+                    new_candidates=new_candidates,
+                    duplicate_chunks=duplicate_chunks
+                )
+                progress_callback(progress)
+        
+        # Results per batch position, so output keeps document order
+        chunk_results = {}
+        candidates_found = 0
+        next_to_stream = 0  # First batch whose results have not been reported yet
+        
+        if ai_parallelism <= 1 or len(batches) <= 1:
+            chunks_done = 0
+            for batch_idx, batch in enumerate(batches):
+                if self.stop_extraction or candidates_found >= max_candidates:
+                    break
+                
+                # Report progress relative to the chunk range being processed
+                report_progress(chunks_done + 1)
+                
+                chunk_results[batch_idx] = extract_batch(start_chunk + chunks_done, batch)
+                candidates_found += len(chunk_results[batch_idx])
+                chunks_done += len(batch)
+                
+                if chunk_results[batch_idx]:
+                    report_progress(chunks_done, chunk_results[batch_idx])
+        else:
+            # Batches are independent LLM calls, so run a bounded number concurrently
+            executor = ThreadPoolExecutor(max_workers=min(len(batches), ai_parallelism))
+            wait_for_workers = True
+            futures = {}
+            try:
+                futures = {
+                    executor.submit(extract_batch, start_chunk + batch_idx * batch_size, batch): batch_idx
+                    for batch_idx, batch in enumerate(batches)
+                }
+                
+                chunks_done = 0
+                for future in as_completed(futures):
+                    batch_idx = futures[future]
+                    chunk_results[batch_idx] = future.result()
+                    candidates_found += len(chunk_results[batch_idx])
+                    chunks_done += len(batches[batch_idx])
+                    
+                    # Stream finished results only in document order
+                    new_candidates = []
+                    while next_to_stream in chunk_results:
+                        new_candidates.extend(chunk_results[next_to_stream])
+                        next_to_stream += 1
+                    
+                    report_progress(chunks_done, new_candidates or None)
+                    
+                    if self.stop_extraction or candidates_found >= max_candidates:
+                        # Return without waiting for requests still in flight
+                        wait_for_workers = False
+                        break
+            finally:
+                # Drop batches that have not started yet (shutdown's cancel_futures needs Python 3.9)
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=wait_for_workers)
+        
+        all_candidates = []
+        for offset in sorted(chunk_results):
+            all_candidates.extend(chunk_results[offset])
         
         if progress_callback:
             # Report completion relative to the chunk range processed
-            total_progress = end_chunk - start_chunk
             progress = ExtractionProgress(
                 current_chunk=total_progress,
                 total_chunks=total_progress,
                 candidates_found=len(all_candidates),
                 current_method='ai',
-                is_complete=True
+                is_complete=True,
+                duplicate_chunks=duplicate_chunks
             )
             progress_callback(progress)
         
@@ -999,4 +1299,52 @@ class AnswerExtractor:
                     'answer': candidate.text
                 })
         
-        return qa_pairs
\ No newline at end of file
+        return qa_pairs
+
+
+def _extraction_process_main(conn,
+                             settings: Dict[str, Any],
+                             document_data: Dict[str, Any],
+                             methods: Optional[List[str]],
+                             max_candidates: int,
+                             chunk_range: Optional[Dict[str, int]],
+                             ai_config: Optional[APIConfig],
+                             ai_max_pairs: int,
+                             ai_custom_prompt: Optional[str],
+                             ai_parallelism: int = 1,
+                             ai_batch_size: int = 1,
+                             ai_ignore_cache: bool = False):
+    """Entry point of the extraction process; reports progress and results over conn"""
+    extractor = AnswerExtractor()
+    for name, value in settings.items():
+        setattr(extractor, name, value)
+    
+    def report_progress(progress: ExtractionProgress):
+        conn.send(('progress', progress))
+    
+    finished = threading.Event()
+    
+    def watch_for_stop():
+        # Listen for a stop request from the parent, even while a step is in progress
+        try:
+            while not finished.is_set():
+                if conn.poll(0.1) and conn.recv() == 'stop':
+                    extractor.stop_extraction = True
+        except (EOFError, OSError):
+            pass
+    
+    watcher = threading.Thread(target=watch_for_stop, daemon=True)
+    watcher.start()
+    
+    try:
+        candidates = extractor.extract_answers_optimized(
+            document_data, methods, report_progress, max_candidates, chunk_range,
+            ai_config, ai_max_pairs, ai_custom_prompt, ai_parallelism, ai_batch_size, ai_ignore_cache
+        )
+        conn.send(('complete', candidates))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        finished.set()
+        watcher.join()
+        conn.close()
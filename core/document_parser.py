@@ -4,6 +4,7 @@ Optimized document parsing for large files with lazy loading and chunking
 
 import os
 import threading
+import zlib
 from typing import Optional, Dict, Any, List, Generator, Callable
 import PyPDF2
 import pdfplumber
@@ -19,6 +20,7 @@ class DocumentChunk:
     char_start: int
     char_end: int
     is_loaded: bool = False
+    compressed_content: Optional[bytes] = None  # Text captured during indexing
 
 @dataclass
 class DocumentIndex:
@@ -31,9 +33,11 @@ class DocumentIndex:
 class DocumentParser:
     """Enhanced document parser for large files with lazy loading"""
     
-    def __init__(self, chunk_size_pages: int = 10, max_chars_per_chunk: int = 50000):
+    def __init__(self, chunk_size_pages: int = 10, max_chars_per_chunk: int = 50000,
+                 max_prefetch_pages: int = 1000):
         self.chunk_size_pages = chunk_size_pages
         self.max_chars_per_chunk = max_chars_per_chunk
+        self.max_prefetch_pages = max_prefetch_pages  # Above this, fall back to estimated index
         self.supported_extensions = {'.pdf', '.txt', '.md'}
         self._cache = {}  # Simple content cache
     
@@ -67,32 +71,15 @@ class DocumentParser:
                 if progress_callback:
                     progress_callback(0, total_pages)
                 
-                # Create index by reading page boundaries without full content
-                chunks = []
-                page_char_positions = [0]
-                current_char_pos = 0
-                
-                # Process in chunks
-                for chunk_start in range(0, total_pages, self.chunk_size_pages):
-                    chunk_end = min(chunk_start + self.chunk_size_pages, total_pages)
-                    
-                    # Estimate chunk size without loading full content
-                    estimated_chars = (chunk_end - chunk_start) * 2000  # Rough estimate
-                    
-                    chunk = DocumentChunk(
-                        chunk_id=len(chunks),
-                        page_start=chunk_start,
-                        page_end=chunk_end,
-                        content="",  # Will be loaded on demand
-                        char_start=current_char_pos,
-                        char_end=current_char_pos + estimated_chars,
-                        is_loaded=False
+                # Extract text while the PDF is open so chunks never re-parse it
+                if total_pages <= self.max_prefetch_pages:
+                    chunks, page_char_positions, current_char_pos = self._index_pdf_pages(
+                        pdf, total_pages, progress_callback
+                    )
+                else:
+                    chunks, page_char_positions, current_char_pos = self._estimate_pdf_chunks(
+                        total_pages, progress_callback
                     )
-                    chunks.append(chunk)
-                    current_char_pos += estimated_chars
-                    
-                    if progress_callback:
-                        progress_callback(chunk_end, total_pages)
                 
                 # Create document index
                 doc_index = DocumentIndex(
@@ -120,6 +107,100 @@ class DocumentParser:
         except Exception as e:
             print("Error parsing PDF!!")
     
+    def _index_pdf_pages(self, pdf, total_pages: int,
+                         progress_callback: Optional[Callable[[int, int], None]] = None):
+        """Build chunks with exact offsets, keeping compressed page text for later loads"""
+        chunks = []
+        page_char_positions = []
+        current_char_pos = 0
+        
+        for chunk_start in range(0, total_pages, self.chunk_size_pages):
+            chunk_end = min(chunk_start + self.chunk_size_pages, total_pages)
+            
+            content_parts = []
+            chunk_page_positions = []
+            part_pos = current_char_pos
+            failed = False
+            for page_num in range(chunk_start, chunk_end):
+                page = pdf.pages[page_num]
+                try:
+                    page_text = page.extract_text() or ""
+                except Exception as e:
+                    print(f"Failed to index PDF page {page_num + 1}: {e}")
+                    failed = True
+                    break
+                finally:
+                    page.flush_cache()  # Drop the parsed layout so only one page is held at a time
+                
+                if content_parts:
+                    part_pos += 1  # Newline joining pages
+                chunk_page_positions.append(part_pos)
+                content_parts.append(page_text)
+                part_pos += len(page_text)
+                
+                if progress_callback:
+                    progress_callback(page_num + 1, total_pages)
+            
+            if failed:
+                # Leave this chunk to the on-demand loader and its PyPDF2 fallback
+                chunk_chars = (chunk_end - chunk_start) * 2000  # Rough estimate
+                page_char_positions.extend(
+                    current_char_pos + i * 2000 for i in range(chunk_end - chunk_start)
+                )
+                compressed_content = None
+                if progress_callback:
+                    progress_callback(chunk_end, total_pages)
+            else:
+                content = '\n'.join(content_parts)
+                chunk_chars = len(content)
+                page_char_positions.extend(chunk_page_positions)
+                compressed_content = zlib.compress(content.encode('utf-8'))
+            
+            chunk = DocumentChunk(
+                chunk_id=len(chunks),
+                page_start=chunk_start,
+                page_end=chunk_end,
+                content="",  # Decompressed (or loaded) on demand
+                char_start=current_char_pos,
+                char_end=current_char_pos + chunk_chars,
+                is_loaded=False,
+                compressed_content=compressed_content
+            )
+            chunks.append(chunk)
+            current_char_pos += chunk_chars
+        
+        return chunks, page_char_positions or [0], current_char_pos
+    
+    def _estimate_pdf_chunks(self, total_pages: int,
+                             progress_callback: Optional[Callable[[int, int], None]] = None):
+        """Build chunks from estimated sizes without reading page content"""
+        chunks = []
+        page_char_positions = [0]
+        current_char_pos = 0
+        
+        for chunk_start in range(0, total_pages, self.chunk_size_pages):
+            chunk_end = min(chunk_start + self.chunk_size_pages, total_pages)
+            
+            # Estimate chunk size without loading full content
+            estimated_chars = (chunk_end - chunk_start) * 2000  # Rough estimate
+            
+            chunk = DocumentChunk(
+                chunk_id=len(chunks),
+                page_start=chunk_start,
+                page_end=chunk_end,
+                content="",  # Will be loaded on demand
+                char_start=current_char_pos,
+                char_end=current_char_pos + estimated_chars,
+                is_loaded=False
+            )
+            chunks.append(chunk)
+            current_char_pos += estimated_chars
+            
+            if progress_callback:
+                progress_callback(chunk_end, total_pages)
+        
+        return chunks, page_char_positions, current_char_pos
+    
     def _parse_text_lazy(self, file_path: str, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         """Parse text file with lazy loading"""
         try:
@@ -194,7 +275,9 @@ class DocumentParser:
         _, ext = os.path.splitext(file_path.lower())
         
         try:
-            if ext == '.pdf':
+            if chunk.compressed_content is not None:
+                chunk.content = zlib.decompress(chunk.compressed_content).decode('utf-8')
+            elif ext == '.pdf':
                 chunk.content = self._load_pdf_chunk(file_path, chunk)
             else:
                 chunk.content = self._load_text_chunk(file_path, chunk)
@@ -0,0 +1,73 @@
+"""
+On-disk cache of AI Q&A extraction results keyed by content hash
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+import time
+from typing import List, Dict, Optional
+
+from core.llm_client import json_loads, json_dumps
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'llm_data_kit', 'llm_cache.sqlite')
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class LLMResultCache:
+    """SQLite store of Q&A pairs per (model, settings, prompt sent)"""
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()  # One connection shared by extraction worker threads
+        self._puts = 0
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, payload BLOB, created REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, temperature: Optional[float], max_tokens: int, prompt: str,
+                 batch_size: int = 1) -> str:
+        """Build the cache key for one chunk from its request settings, prompt and the chunks per request"""
+        prompt_hash = _sha256(prompt)
+        return _sha256(f"{model}|{temperature}|{max_tokens}|{batch_size}|{prompt_hash}")
+    
+    def get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        """Return cached Q&A pairs, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json_loads(row[0])
+        except ValueError:
+            return None
+    
+    def put(self, key: str, qa_pairs: List[Dict[str, str]]):
+        """Store Q&A pairs, dropping the oldest entries past max_entries"""
+        payload = json_dumps(qa_pairs)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, payload, created) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -3,44 +3,64 @@ LLM API client for generating questions from answers
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import re
+import threading
 from typing import List, Dict, Any, Optional, Callable
-from dataclasses import dataclass
 
-@dataclass
-class APIConfig:
-    """Configuration for LLM API"""
-    provider: str
-    api_key: str
-    base_url: str
-    model: str
-    max_tokens: int = 500
-    temperature: float = 0.7
+from core.llm_providers import APIConfig, API_CONFIGS, get_available_providers, get_default_model, get_base_url
+
+try:
+    import orjson  # Optional: faster JSON decoding and encoding
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """Decode JSON from str or bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> bytes:
+    """Encode an object as UTF-8 JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+def create_session(pool_connections: int = 8, pool_maxsize: int = 16, pool_block: bool = False) -> requests.Session:
+    """Create a session with pooled keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,  # Enough for parallel chunk requests to share connections
+        pool_block=pool_block  # Wait for a pooled connection instead of opening a throwaway one
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Single-chunk output instructions of the Q&A prompt, swapped out when chunks are batched
+_QA_ARRAY_FORMAT_RE = re.compile(r'^FORMAT: Return ONLY a JSON array.*?^\][ \t]*$', re.DOTALL | re.MULTILINE)
+_QA_ARRAY_ONLY_RE = re.compile(r'^Return only the JSON array, no additional text\.[ \t]*$', re.MULTILINE)
+
+class RequestCancelled(Exception):
+    """Raised when a request is aborted because extraction was stopped"""
 
 class LLMClient:
     """Client for interacting with various LLM APIs"""
     
-    # Predefined API configurations
-    API_CONFIGS = {
-        'openrouter': {
-            'base_url': 'https://openrouter.ai/api/v1/chat/completions',
-            'default_model': 'deepseek/deepseek-chat-v3-0324:free',
-        },
-        'openai': {
-            'base_url': 'https://api.openai.com/v1/chat/completions',
-            'default_model': 'gpt-3.5-turbo',
-        },
-        'anthropic': {
-            'base_url': 'https://api.anthropic.com/v1/messages',
-            'default_model': 'claude-3-haiku-20240307',
-        }
-    }
+    API_CONFIGS = API_CONFIGS  # Predefined API configurations
     
-    def __init__(self, config: APIConfig):
+    QA_TEMPERATURE = 0.3  # Lower temperature for more consistent extraction
+    
+    def __init__(self, config: APIConfig, stop_event: Optional[threading.Event] = None,
+                 max_connections: int = 16):
         self.config = config
-        self.session = requests.Session()
+        self.stop_event = stop_event  # When set, pending Q&A requests stop being waited on and raise RequestCancelled
+        # One kept-alive connection per concurrent request, so parallel calls never reconnect
+        self.session = create_session(pool_maxsize=max_connections, pool_block=True)
         self.session.headers.update({
             'Content-Type': 'application/json'
         })
@@ -226,17 +246,17 @@ Please provide only the question, without any additional text or explanation."""
     @classmethod
     def get_available_providers(cls) -> List[str]:
         """Get list of available API providers"""
-        return list(cls.API_CONFIGS.keys())
+        return get_available_providers()
     
     @classmethod
     def get_default_model(cls, provider: str) -> str:
         """Get default model for a provider"""
-        return cls.API_CONFIGS.get(provider, {}).get('default_model', 'gpt-3.5-turbo')
+        return get_default_model(provider)
     
     @classmethod
     def get_base_url(cls, provider: str) -> str:
         """Get base URL for a provider"""
-        return cls.API_CONFIGS.get(provider, {}).get('base_url', 'https://api.openai.com/v1/chat/completions')
+        return get_base_url(provider)
     
     def extract_qa_pairs_from_text(self, 
                                   text_chunk: str, 
@@ -245,13 +265,57 @@ Please provide only the question, without any additional text or explanation."""
                                   custom_prompt: Optional[str] = None) -> List[Dict[str, str]]:
         """Extract Q&A pairs from a text chunk using AI"""
         
+        if self.config.provider == 'anthropic':
+            extract = lambda: self._extract_qa_anthropic(text_chunk, max_pairs, custom_prompt)
+        else:
+            extract = lambda: self._extract_qa_openai_compatible(text_chunk, max_pairs, custom_prompt)
+        
+        return self._with_retries(extract, retry_attempts, [])
+    
+    def extract_qa_pairs_from_segments(self,
+                                       segments: List[str],
+                                       max_pairs: int = 25,
+                                       retry_attempts: int = 3,
+                                       custom_prompt: Optional[str] = None) -> List[List[Dict[str, str]]]:
+        """Extract Q&A pairs from several text chunks in one request, grouped per chunk"""
+        if len(segments) == 1:
+            return [self.extract_qa_pairs_from_text(segments[0], max_pairs, retry_attempts, custom_prompt)]
+        
+        prompt = self._create_qa_batch_prompt(segments, max_pairs, custom_prompt)
+        max_tokens = self._qa_max_tokens() * len(segments)
+        
+        if self.config.provider == 'anthropic':
+            request = lambda: self._request_qa_anthropic(prompt, max_tokens)
+        else:
+            request = lambda: self._request_qa_openai_compatible(prompt, max_tokens)
+        
+        response_text = self._with_retries(request, retry_attempts, None)
+        if response_text is None:
+            return [[] for _ in segments]
+        
+        return self._parse_qa_batch_response(response_text, segments)
+    
+    def qa_request_signature(self, text_chunk: str, max_pairs: int, custom_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Model settings and prompt sent when extracting Q&A pairs from one text chunk"""
+        return {
+            'model': self.config.model,
+            'temperature': None if self.config.provider == 'anthropic' else self.QA_TEMPERATURE,
+            'max_tokens': self._qa_max_tokens(),
+            'prompt': self._create_qa_extraction_prompt(text_chunk, max_pairs, custom_prompt)
+        }
+    
+    def _qa_max_tokens(self) -> int:
+        """Token budget for one chunk's Q&A extraction reply"""
+        return min(self.config.max_tokens * 2, 1500)
+    
+    def _with_retries(self, request: Callable[[], Any], retry_attempts: int, default: Any) -> Any:
+        """Run an API request, backing off on rate limits and retrying other failures"""
         for attempt in range(retry_attempts):
             try:
-                if self.config.provider == 'anthropic':
-                    return self._extract_qa_anthropic(text_chunk, max_pairs, custom_prompt)
-                else:
-                    return self._extract_qa_openai_compatible(text_chunk, max_pairs, custom_prompt)
+                return request()
                     
+            except RequestCancelled:
+                raise
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 429:
                     # Rate limited - wait and retry
@@ -266,12 +330,16 @@ Please provide only the question, without any additional text or explanation."""
                     raise e
                 time.sleep(2)  # Brief pause before retry
         
-        return []
+        return default
     
     def _extract_qa_openai_compatible(self, text_chunk: str, max_pairs: int, custom_prompt: Optional[str] = None) -> List[Dict[str, str]]:
         """Extract Q&A pairs using OpenAI-compatible API"""
         prompt = self._create_qa_extraction_prompt(text_chunk, max_pairs, custom_prompt)
-        
+        response_text = self._request_qa_openai_compatible(prompt, self._qa_max_tokens())  # Increase for Q&A extraction
+        return self._parse_qa_response(response_text)
+    
+    def _request_qa_openai_compatible(self, prompt: str, max_tokens: int) -> str:
+        """Send a Q&A extraction prompt to an OpenAI-compatible API and return the reply text"""
         payload = {
             'model': self.config.model,
             'messages': [
@@ -284,8 +352,8 @@ Please provide only the question, without any additional text or explanation."""
                     'content': prompt
                 }
             ],
-            'max_tokens': min(self.config.max_tokens * 2, 1500),  # Increase for Q&A extraction
-            'temperature': 0.3  # Lower temperature for more consistent extraction
+            'max_tokens': max_tokens,
+            'temperature': self.QA_TEMPERATURE
         }
         
         if self.config.provider == 'openrouter':
@@ -293,28 +361,24 @@ Please provide only the question, without any additional text or explanation."""
             payload['frequency_penalty'] = 0
             payload['presence_penalty'] = 0
         
-        try:
-            response = self.session.post(self.config.base_url, json=payload, timeout=60)
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            error_detail = f"HTTP {e.response.status_code}: {e.response.text[:500]}"
-            raise Exception(f"API request failed - {error_detail}")
-        
-        data = response.json()
+        data = self._post_qa_request(payload)
         
         if 'choices' in data and data['choices']:
-            response_text = data['choices'][0]['message']['content'].strip()
-            return self._parse_qa_response(response_text)
+            return data['choices'][0]['message']['content'].strip()
         else:
             raise Exception("No valid response from API")
     
     def _extract_qa_anthropic(self, text_chunk: str, max_pairs: int, custom_prompt: Optional[str] = None) -> List[Dict[str, str]]:
         """Extract Q&A pairs using Anthropic API"""
         prompt = self._create_qa_extraction_prompt(text_chunk, max_pairs, custom_prompt)
-        
+        response_text = self._request_qa_anthropic(prompt, self._qa_max_tokens())
+        return self._parse_qa_response(response_text)
+    
+    def _request_qa_anthropic(self, prompt: str, max_tokens: int) -> str:
+        """Send a Q&A extraction prompt to the Anthropic API and return the reply text"""
         payload = {
             'model': self.config.model,
-            'max_tokens': min(self.config.max_tokens * 2, 1500),
+            'max_tokens': max_tokens,
             'messages': [
                 {
                     'role': 'user',
@@ -323,20 +387,58 @@ Please provide only the question, without any additional text or explanation."""
             ]
         }
         
+        data = self._post_qa_request(payload)
+        
+        if 'content' in data and data['content']:
+            return data['content'][0]['text'].strip()
+        else:
+            raise Exception("No valid response from API")
+    
+    def _post_qa_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a Q&A request; when stop_event is set while waiting, raise RequestCancelled"""
+        if self.stop_event is None:
+            return self._send_qa_request(payload)
+        
+        # The wait for response headers cannot be interrupted from this thread, so the
+        # request runs on a helper thread and is abandoned if extraction is stopped
+        outcome = {}
+        done = threading.Event()
+        
+        def send():
+            try:
+                outcome['data'] = self._send_qa_request(payload)
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+        
+        threading.Thread(target=send, daemon=True).start()
+        while not done.wait(0.1):
+            if self.stop_event.is_set():
+                raise RequestCancelled("Request cancelled")
+        
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['data']
+    
+    def _send_qa_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a Q&A request, reading the body in pieces so a stop request can drop it early"""
         try:
-            response = self.session.post(self.config.base_url, json=payload, timeout=60)
+            response = self.session.post(self.config.base_url, json=payload, timeout=60, stream=True)
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             error_detail = f"HTTP {e.response.status_code}: {e.response.text[:500]}"
+            e.response.close()
             raise Exception(f"API request failed - {error_detail}")
         
-        data = response.json()
+        body = bytearray()
+        with response:
+            for piece in response.iter_content(1024):
+                if self.stop_event is not None and self.stop_event.is_set():
+                    raise RequestCancelled("Request cancelled")  # Closing the response drops the connection
+                body.extend(piece)
         
-        if 'content' in data and data['content']:
-            response_text = data['content'][0]['text'].strip()
-            return self._parse_qa_response(response_text)
-        else:
-            raise Exception("No valid response from API")
+        return json_loads(body)
     
     def _create_qa_extraction_prompt(self, text_chunk: str, max_pairs: int, custom_prompt: Optional[str] = None) -> str:
         """Create prompt for Q&A extraction"""
@@ -367,6 +469,62 @@ TEXT TO ANALYZE:
 
 Return only the JSON array, no additional text."""
     
+    def _create_qa_batch_prompt(self, segments: List[str], max_pairs: int, custom_prompt: Optional[str] = None) -> str:
+        """Create one prompt covering several text chunks, asking for pairs grouped per chunk"""
+        segmented_text = '\n'.join(
+            f"---SEG {i}---\n{segment[:4000]}" for i, segment in enumerate(segments, start=1)
+        )
+        
+        batch_format = f"""FORMAT: The text is split into {len(segments)} segments marked ---SEG <number>---. Extract up to {max_pairs} pairs from each segment separately. Return ONLY a JSON object mapping each segment number to its array of pairs, like this:
+{{"1": [{{"question": "What is...", "answer": "exact text from segment 1"}}], "2": [...]}}"""
+        
+        # Swap the single-array output instructions for the grouped format before the text goes in
+        template = custom_prompt or self._create_qa_extraction_prompt("{text_chunk}", max_pairs)
+        template, replaced = _QA_ARRAY_FORMAT_RE.subn(lambda match: batch_format, template)
+        template = _QA_ARRAY_ONLY_RE.sub("Return only the JSON object, no additional text.", template)
+        if not replaced:
+            template = f"{template}\n\n{batch_format}"
+        
+        prompt = template.replace("{max_pairs}", str(max_pairs))
+        return prompt.replace("{text_chunk}", segmented_text)
+    
+    def _parse_qa_batch_response(self, response_text: str, segments: List[str]) -> List[List[Dict[str, str]]]:
+        """Parse a batched LLM response into Q&A pairs per segment"""
+        grouped = [[] for _ in segments]
+        
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        try:
+            data = json_loads(json_match.group(0)) if json_match else None
+        except json.JSONDecodeError:
+            data = None
+        
+        if isinstance(data, dict) and not {'question', 'answer'} <= data.keys():
+            unmatched = []  # Pairs under keys that are not a segment number (e.g. "SEG 1")
+            for key, pairs in data.items():
+                if not isinstance(pairs, list):
+                    continue
+                try:
+                    index = int(str(key).strip()) - 1
+                except ValueError:
+                    index = -1
+                if 0 <= index < len(segments):
+                    grouped[index].extend(self._validate_qa_pairs(pairs))
+                else:
+                    unmatched.extend(self._validate_qa_pairs(pairs))
+            self._attribute_qa_pairs(unmatched, segments, grouped)
+            return grouped
+        
+        # Model ignored the grouping
+        self._attribute_qa_pairs(self._parse_qa_response(response_text), segments, grouped)
+        return grouped
+    
+    @staticmethod
+    def _attribute_qa_pairs(qa_pairs: List[Dict[str, str]], segments: List[str], grouped: List[List[Dict[str, str]]]):
+        """Add each pair to the group of the segment quoting its answer (the first segment if none does)"""
+        for pair in qa_pairs:
+            index = next((i for i, segment in enumerate(segments) if pair['answer'] in segment), 0)
+            grouped[index].append(pair)
+    
     def _parse_qa_response(self, response_text: str) -> List[Dict[str, str]]:
         """Parse LLM response into Q&A pairs"""
         try:
@@ -384,28 +542,31 @@ Return only the JSON array, no additional text."""
                     return self._parse_fallback_format(response_text)
             
             # Parse the JSON
-            qa_pairs = json.loads(json_str)
-            
-            # Validate and clean the pairs
-            validated_pairs = []
-            for pair in qa_pairs:
-                if isinstance(pair, dict) and 'question' in pair and 'answer' in pair:
-                    question = pair['question'].strip()
-                    answer = pair['answer'].strip()
-                    
-                    # Basic validation
-                    if len(question) > 10 and len(answer) > 20:
-                        validated_pairs.append({
-                            'question': question,
-                            'answer': answer
-                        })
+            qa_pairs = json_loads(json_str)
             
-            return validated_pairs
+            return self._validate_qa_pairs(qa_pairs)
                 
         except json.JSONDecodeError:
             # Fallback parsing
             return self._parse_fallback_format(response_text)
     
+    def _validate_qa_pairs(self, qa_pairs: List[Any]) -> List[Dict[str, str]]:
+        """Validate and clean parsed Q&A pairs"""
+        validated_pairs = []
+        for pair in qa_pairs:
+            if isinstance(pair, dict) and 'question' in pair and 'answer' in pair:
+                question = pair['question'].strip()
+                answer = pair['answer'].strip()
+                
+                # Basic validation
+                if len(question) > 10 and len(answer) > 20:
+                    validated_pairs.append({
+                        'question': question,
+                        'answer': answer
+                    })
+        
+        return validated_pairs
+    
     def _parse_fallback_format(self, response_text: str) -> List[Dict[str, str]]:
         """Fallback parser for non-JSON responses"""
         pairs = []
@@ -0,0 +1,44 @@
+"""
+LLM provider settings, importable without loading the HTTP client
+"""
+
+from typing import List
+from dataclasses import dataclass
+
+@dataclass
+class APIConfig:
+    """Configuration for LLM API"""
+    provider: str
+    api_key: str
+    base_url: str
+    model: str
+    max_tokens: int = 500
+    temperature: float = 0.7
+
+# Predefined API configurations
+API_CONFIGS = {
+    'openrouter': {
+        'base_url': 'https://openrouter.ai/api/v1/chat/completions',
+        'default_model': 'deepseek/deepseek-chat-v3-0324:free',
+    },
+    'openai': {
+        'base_url': 'https://api.openai.com/v1/chat/completions',
+        'default_model': 'gpt-3.5-turbo',
+    },
+    'anthropic': {
+        'base_url': 'https://api.anthropic.com/v1/messages',
+        'default_model': 'claude-3-haiku-20240307',
+    }
+}
+
+def get_available_providers() -> List[str]:
+    """Get list of available API providers"""
+    return list(API_CONFIGS.keys())
+
+def get_default_model(provider: str) -> str:
+    """Get default model for a provider"""
+    return API_CONFIGS.get(provider, {}).get('default_model', 'gpt-3.5-turbo')
+
+def get_base_url(provider: str) -> str:
+    """Get base URL for a provider"""
+    return API_CONFIGS.get(provider, {}).get('base_url', 'https://api.openai.com/v1/chat/completions')
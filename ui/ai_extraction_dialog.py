@@ -6,12 +6,21 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from typing import Dict, Any, List, Optional
 import threading
+import queue
+import functools
+import itertools
 import json
+import os
 import requests
 import time
 
+try:
+    import ijson  # Optional: stream-parse the model catalog
+except ImportError:
+    ijson = None
+
 from core.answer_extractor import AnswerExtractor, AnswerCandidate, ExtractionProgress
-from core.llm_client import LLMClient, APIConfig
+from core.llm_client import LLMClient, APIConfig, create_session, json_loads, json_dumps
 
 
 class AIExtractionDialog:
@@ -28,6 +37,19 @@ class AIExtractionDialog:
         {"id": "google/gemma-2-9b-it:free", "name": "Gemma 2 9B (Free)", "description": "Google's free model"}
     ]
     
+    # Default extraction requirements shown in the prompt editor
+    DEFAULT_REQUIREMENTS = """REQUIREMENTS:
+1. Answers must be EXACT quotes from the provided text (no paraphrasing)
+2. Questions should be clear, specific, and naturally lead to the answer
+3. Focus on factual information, definitions, explanations, and key concepts
+4. Avoid yes/no questions - prefer questions that require detailed answers
+5. Ensure questions are varied in type (what, how, why, when, where, etc.)"""
+    
+    # OpenRouter model catalog and its on-disk cache
+    MODELS_URL = "https://openrouter.ai/api/v1/models"
+    MODEL_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'llm_data_kit', 'openrouter_models.json')
+    MODEL_CACHE_TTL = 24 * 60 * 60  # Seconds before the cache is revalidated
+    
     def __init__(self, parent: tk.Widget, document_data: Dict[str, Any], api_config: Dict[str, Any]):
         self.parent = parent
         self.document_data = document_data
@@ -35,6 +57,10 @@ class AIExtractionDialog:
         self.result = None
         self.candidates = []
         self.ai_qa_pairs = []
+        self._answer_previews = []  # Tree answer previews, parallel to the displayed rows
+        
+        # Pooled HTTP session reused across model list refreshes
+        self._session = create_session()
         
         # Extraction state
         self.extractor = AnswerExtractor()
@@ -44,11 +70,24 @@ class AIExtractionDialog:
         # Available models (will be populated)
         self.available_models = self.POPULAR_MODELS.copy()
         
+        # Combo box entries already built, parallel to the model ids they were built from
+        self._model_ids = ()
+        self._model_options = []
+        self._model_index_by_id = {}
+        
+        # Pending temperature label update (debounced while dragging)
+        self._pending_temp = None
+        self._temp_after_id = None
+        
+        # Callbacks from background threads, run on the Tk thread by _drain_ui_queue
+        self._ui_queue = queue.Queue()
+        
         self.create_dialog()
     
     def create_dialog(self):
         """Create the AI extraction dialog"""
         self.dialog = tk.Toplevel(self.parent)
+        self.dialog.withdraw()  # Build hidden so layout is computed once when shown
         self.dialog.title("AI Q&A Extraction")
         
         # Dialog dimensions
@@ -57,10 +96,8 @@ class AIExtractionDialog:
         
         self.dialog.minsize(dialog_width, dialog_height)
         self.dialog.transient(self.parent)
-        self.dialog.grab_set()
         
         # Center the dialog
-        self.dialog.update_idletasks()
         screen_width = self.dialog.winfo_screenwidth()
         screen_height = self.dialog.winfo_screenheight()
         x = (screen_width - dialog_width) // 2
@@ -97,6 +134,14 @@ class AIExtractionDialog:
         self.dialog.bind('<Escape>', lambda e: self.cancel())
         self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
+        # Start running callbacks queued by background threads
+        self._drain_ui_queue()
+        
+        # Show the finished dialog; the grab needs a viewable window
+        self.dialog.update_idletasks()
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        
         # Wait for dialog to close
         self.dialog.wait_window()
     
@@ -134,7 +179,7 @@ class AIExtractionDialog:
         self.temp_label.pack(side=tk.LEFT)
         
         # Update temperature label when scale changes
-        temp_scale.configure(command=lambda val: self.temp_label.config(text=f"{float(val):.2f}"))
+        temp_scale.configure(command=self._on_temp_changed)
         
         # Max tokens (moved next to temperature)
         tokens_frame = ttk.Frame(config_frame)
@@ -183,6 +228,28 @@ class AIExtractionDialog:
         pairs_entry = ttk.Entry(chunk_frame, textvariable=self.max_pairs_var, width=6)
         pairs_entry.pack(side=tk.LEFT, padx=(5, 0))
         
+        # Request settings
+        request_frame = ttk.Frame(options_frame)
+        request_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Number of requests sent to the API concurrently
+        ttk.Label(request_frame, text="Parallel requests:").pack(side=tk.LEFT)
+        
+        self.parallel_var = tk.StringVar(value="4")
+        parallel_entry = ttk.Entry(request_frame, textvariable=self.parallel_var, width=6)
+        parallel_entry.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Chunks combined into a single prompt to share the prompt overhead
+        ttk.Label(request_frame, text="Chunks per request:").pack(side=tk.LEFT, padx=(20, 0))
+        
+        self.batch_size_var = tk.StringVar(value="1")
+        batch_entry = ttk.Entry(request_frame, textvariable=self.batch_size_var, width=6)
+        batch_entry.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Skip results cached from earlier runs and query the API again
+        self.ignore_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(request_frame, text="Ignore cache", variable=self.ignore_cache_var).pack(side=tk.LEFT, padx=(20, 0))
+        
         # Custom prompt section
         prompt_label = ttk.Label(options_frame, text="Custom Requirements (optional):", font=('Arial', 9, 'bold'))
         prompt_label.pack(anchor=tk.W, pady=(0, 5))
@@ -196,19 +263,11 @@ class AIExtractionDialog:
         self.prompt_text = scrolledtext.ScrolledText(options_frame, height=6, wrap=tk.WORD, font=('Arial', 9))
         self.prompt_text.pack(fill=tk.X, pady=(0, 10))
         
-        # Default requirements (simplified)
-        default_requirements = """REQUIREMENTS:
-1. Answers must be EXACT quotes from the provided text (no paraphrasing)
-2. Questions should be clear, specific, and naturally lead to the answer
-3. Focus on factual information, definitions, explanations, and key concepts
-4. Avoid yes/no questions - prefer questions that require detailed answers
-5. Ensure questions are varied in type (what, how, why, when, where, etc.)"""
-        
-        self.prompt_text.insert(1.0, default_requirements)
+        self.prompt_text.insert(1.0, self.DEFAULT_REQUIREMENTS)
         
         # Reset prompt button
         reset_btn = ttk.Button(options_frame, text="Reset to Default", 
-                              command=lambda: self.reset_prompt(default_requirements))
+                              command=lambda: self.reset_prompt(self.DEFAULT_REQUIREMENTS))
         reset_btn.pack(anchor=tk.W)
     
     def create_results_section(self, parent):
@@ -247,12 +306,15 @@ class AIExtractionDialog:
         
         self.selection_count_label = ttk.Label(selection_frame, text="0 selected")
         self.selection_count_label.pack(side=tk.RIGHT)
+        self._shown_selection_count = 0
         
         # Bind events
         self.results_tree.bind('<Button-1>', self.on_tree_click)
         self.results_tree.bind('<Double-Button-1>', self.on_tree_double_click)
         
         self.selected_indices = set()
+        self._item_ids = []  # Tree item ids, parallel to self.ai_qa_pairs
+        self._iid_to_index = {}  # Tree item id -> index into self.ai_qa_pairs
     
     def create_progress_section(self, parent):
         """Create progress section"""
@@ -286,49 +348,108 @@ class AIExtractionDialog:
         ttk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT, padx=(5, 0))
         ttk.Button(button_frame, text="Add Selected", command=self.add_selected).pack(side=tk.RIGHT)
     
-    def load_models_async(self):
+    def load_models_async(self, force_refresh: bool = False):
         """Load available models from OpenRouter API in background"""
+        def show_models(models):
+            # Merge into the combo box once Tk is idle, after pending user events
+            self._call_in_ui(self.dialog.after_idle, self.update_available_models, models)
+        
         def load_models():
+            cached_models, etag, cached_at = self._load_model_cache()
+            
+            # Fresh cache: skip the network entirely
+            if cached_models is not None and not force_refresh and time.time() - cached_at < self.MODEL_CACHE_TTL:
+                show_models(cached_models)
+                return
+            
             try:
-                response = requests.get("https://openrouter.ai/api/v1/models", timeout=10)
-                if response.status_code == 200:
-                    models_data = response.json()
-                    if isinstance(models_data, dict) and 'data' in models_data:
-                        models_list = models_data['data']
-                    else:
-                        models_list = models_data
-                    
-                    # Extract model info
-                    api_models = []
-                    for model in models_list:
-                        if isinstance(model, dict) and 'id' in model:
-                            name = model.get('name', model['id'])
-                            description = model.get('description', '')
-                            if len(description) > 50:
-                                description = description[:47] + "..."
-                            
-                            api_models.append({
-                                'id': model['id'],
-                                'name': name,
-                                'description': description
-                            })
+                headers = {'If-None-Match': etag} if etag and cached_models is not None else {}
+                response = self._session.get(self.MODELS_URL, headers=headers, timeout=10, stream=ijson is not None)
+                # Closing the response releases its pooled connection, even when the body is left unread
+                with response:
                     
-                    # Update models list on main thread
-                    self.dialog.after(0, lambda: self.update_available_models(api_models))
+                    if response.status_code == 304 and cached_models is not None:
+                        # Catalog unchanged; restart the cache TTL
+                        os.utime(self.MODEL_CACHE_PATH)
+                        show_models(cached_models)
+                        
+                    elif response.status_code == 200:
+                        # Extract model info
+                        api_models = []
+                        for model in self._iter_catalog_models(response):
+                            if isinstance(model, dict) and 'id' in model:
+                                name = model.get('name', model['id'])
+                                description = model.get('description', '')
+                                if len(description) > 50:
+                                    description = description[:47] + "..."
+                                
+                                api_models.append({
+                                    'id': model['id'],
+                                    'name': name,
+                                    'description': description
+                                })
+                        
+                        self._save_model_cache(api_models, response.headers.get('ETag'))
+                        
+                        show_models(api_models)
                     
             except Exception as e:
                 print(f"Failed to load models from API: {e}")
+                
+                # Fall back to a stale cache rather than only the popular models
+                if cached_models is not None:
+                    show_models(cached_models)
         
         # Run in background thread
         threading.Thread(target=load_models, daemon=True).start()
     
+    @staticmethod
+    def _iter_catalog_models(response):
+        """Yield model entries from a catalog response, streaming them when ijson is available"""
+        if ijson is not None:
+            response.raw.decode_content = True
+            # The catalog is either {"data": [...]} or a bare list of models
+            events = ijson.parse(response.raw)
+            first = next(events, None)
+            if first is None:
+                return
+            prefix = 'data.item' if first[1] == 'start_map' else 'item'
+            yield from ijson.items(itertools.chain([first], events), prefix)
+            return
+        
+        models_data = json_loads(response.content)
+        if isinstance(models_data, dict) and 'data' in models_data:
+            yield from models_data['data']
+        else:
+            yield from models_data
+    
+    def _load_model_cache(self):
+        """Load cached API models, their ETag and cache time ((None, None, 0) if unavailable)"""
+        try:
+            with open(self.MODEL_CACHE_PATH, 'rb') as f:
+                cache = json_loads(f.read())
+            return cache['models'], cache.get('etag'), os.path.getmtime(self.MODEL_CACHE_PATH)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, None, 0
+    
+    def _save_model_cache(self, api_models, etag):
+        """Save API models and their ETag to the on-disk cache"""
+        try:
+            os.makedirs(os.path.dirname(self.MODEL_CACHE_PATH), exist_ok=True)
+            with open(self.MODEL_CACHE_PATH, 'wb') as f:
+                f.write(json_dumps({'etag': etag, 'models': api_models}))
+        except OSError as e:
+            print(f"Failed to cache models: {e}")
+    
     def update_available_models(self, api_models):
         """Update the available models list"""
         # Combine popular models with API models, removing duplicates
         all_models = self.POPULAR_MODELS.copy()
+        existing_ids = {m['id'] for m in all_models}
         
         for api_model in api_models:
-            if not any(m['id'] == api_model['id'] for m in all_models):
+            if api_model['id'] not in existing_ids:
+                existing_ids.add(api_model['id'])
                 all_models.append(api_model)
         
         self.available_models = all_models
@@ -336,25 +457,65 @@ class AIExtractionDialog:
     
     def update_model_combo(self):
         """Update the model combo box"""
-        model_options = []
-        for model in self.available_models:
-            display_text = f"{model['name']} ({model['id']})"
-            if model.get('description'):
-                display_text += f" - {model['description']}"
-            model_options.append(display_text)
-        
-        self.model_combo['values'] = model_options
+        model_ids = tuple(model['id'] for model in self.available_models)
+        
+        if model_ids != self._model_ids:
+            # Only format entries past the unchanged prefix; rebuild if the list was reordered
+            known = len(self._model_ids)
+            if model_ids[:known] != self._model_ids:
+                known = 0
+                self._model_options = []
+                self._model_index_by_id = {}
+            
+            for i in range(known, len(model_ids)):
+                model = self.available_models[i]
+                self._model_options.append(
+                    f"{model['name']} ({model['id']}) - {model['description']}" if model.get('description')
+                    else f"{model['name']} ({model['id']})"
+                )
+                self._model_index_by_id[model['id']] = i
+            
+            self._model_ids = model_ids
+            self.model_combo['values'] = self._model_options
         
         # Select current model if it exists
-        current_model = self.model_var.get()
-        for i, model in enumerate(self.available_models):
-            if model['id'] == current_model:
-                self.model_combo.current(i)
-                break
+        current_index = self._model_index_by_id.get(self.model_var.get())
+        if current_index is not None:
+            self.model_combo.current(current_index)
     
     def refresh_models(self):
         """Refresh the models list"""
-        self.load_models_async()
+        self.load_models_async(force_refresh=True)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _build_prompt(requirements: str, max_pairs: int) -> str:
+        """Build the extraction prompt template; only {text_chunk} is left for per-chunk substitution"""
+        return f"""Extract up to {max_pairs} high-quality question-answer pairs from the following text.
+
+{requirements}
+
+FORMAT: Return ONLY a JSON array like this:
+[
+  {{"question": "What is...", "answer": "exact text from passage"}},
+  {{"question": "How does...", "answer": "exact text from passage"}}
+]
+
+TEXT TO ANALYZE:
+{{text_chunk}}
+
+Return only the JSON array, no additional text."""
+    
+    def _on_temp_changed(self, val):
+        """Schedule a temperature label update, at most one per 30ms"""
+        self._pending_temp = float(val)
+        if self._temp_after_id is None:
+            self._temp_after_id = self.dialog.after(30, self._flush_temp_label)
+    
+    def _flush_temp_label(self):
+        """Show the latest temperature value"""
+        self._temp_after_id = None
+        self.temp_label.config(text=f"{self._pending_temp:.2f}")
     
     def reset_prompt(self, default_requirements):
         """Reset requirements to default"""
@@ -370,8 +531,10 @@ class AIExtractionDialog:
                 end_chunk = int(self.end_chunk_var.get())
                 max_pairs = int(self.max_pairs_var.get())
                 max_tokens = int(self.max_tokens_var.get())
+                parallel_requests = max(1, int(self.parallel_var.get()))
+                batch_size = max(1, int(self.batch_size_var.get()))
             except ValueError:
-                messagebox.showerror("Error", "Please enter valid numbers for chunk range, max pairs, and max tokens")
+                messagebox.showerror("Error", "Please enter valid numbers for chunk range, max pairs, parallel requests, chunks per request, and max tokens")
                 return
             
             # Get selected model ID
@@ -423,46 +586,7 @@ class AIExtractionDialog:
             
             # Build complete prompt with custom requirements
             custom_requirements = self.prompt_text.get(1.0, tk.END).strip()
-            
-            # Build full prompt with format and text sections
-            if custom_requirements:
-                full_prompt = f"""Extract up to {{max_pairs}} high-quality question-answer pairs from the following text.
-
-{custom_requirements}
-
-FORMAT: Return ONLY a JSON array like this:
-[
-  {{"question": "What is...", "answer": "exact text from passage"}},
-  {{"question": "How does...", "answer": "exact text from passage"}}
-]
-
-TEXT TO ANALYZE:
-{{text_chunk}}
-
-Return only the JSON array, no additional text."""
-            else:
-                # Use default if no custom requirements
-                full_prompt = """Extract up to {{max_pairs}} high-quality question-answer pairs from the following text.
-
-REQUIREMENTS:
-1. Answers must be EXACT quotes from the provided text (no paraphrasing)
-2. Questions should be clear, specific, and naturally lead to the answer
-3. Focus on factual information, definitions, explanations, and key concepts
-4. Avoid yes/no questions - prefer questions that require detailed answers
-5. Ensure questions are varied in type (what, how, why, when, where, etc.)
-
-FORMAT: Return ONLY a JSON array like this:
-[
-  {{"question": "What is...", "answer": "exact text from passage"}},
-  {{"question": "How does...", "answer": "exact text from passage"}}
-]
-
-TEXT TO ANALYZE:
-{{text_chunk}}
-
-Return only the JSON array, no additional text."""
-            
-            custom_prompt = full_prompt
+            custom_prompt = self._build_prompt(custom_requirements or self.DEFAULT_REQUIREMENTS, max_pairs)
             
             # Start extraction in thread
             chunk_range = {'start': start_chunk, 'end': end_chunk} if start_chunk != 0 or end_chunk != total_chunks else None
@@ -470,20 +594,43 @@ Return only the JSON array, no additional text."""
             self.extraction_thread = self.extractor.extract_answers_threaded(
                 self.document_data,
                 methods=['ai'],
-                progress_callback=self.on_extraction_progress,
-                completion_callback=self.on_extraction_complete,
-                error_callback=self.on_extraction_error,
+                progress_callback=lambda progress: self._call_in_ui(self.on_extraction_progress, progress),
+                completion_callback=lambda candidates: self._call_in_ui(self.on_extraction_complete, candidates),
+                error_callback=lambda error: self._call_in_ui(self.on_extraction_error, error),
                 max_candidates=5000,
                 chunk_range=chunk_range,
                 ai_config=api_config,
                 ai_max_pairs=max_pairs,
-                ai_custom_prompt=custom_prompt
+                ai_custom_prompt=custom_prompt,
+                ai_parallelism=parallel_requests,
+                ai_batch_size=batch_size,
+                ai_ignore_cache=self.ignore_cache_var.get()
             )
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start extraction: {str(e)}")
             self.reset_extraction_state()
     
+    def _call_in_ui(self, func, *args):
+        """Queue a callback from a background thread to run on the Tk main loop"""
+        # Only the queue is touched here; Tk is not safe to call from other threads
+        self._ui_queue.put((func, args))
+    
+    def _drain_ui_queue(self):
+        """Run queued background callbacks, then poll again (Tk thread only)"""
+        if not self.dialog.winfo_exists():
+            return  # Dialog closed; late callbacks are dropped
+        
+        try:
+            while True:
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.dialog.after(50, self._drain_ui_queue)  # Keep polling even if a callback failed
+    
     def on_extraction_progress(self, progress: ExtractionProgress):
         """Handle extraction progress"""
         if progress.error_message:
@@ -494,24 +641,28 @@ Return only the JSON array, no additional text."""
             progress_percent = (progress.current_chunk / progress.total_chunks) * 100
             self.progress_var.set(progress_percent)
         
-        self.progress_label.config(
-            text=f"Chunk {progress.current_chunk}/{progress.total_chunks} ({progress.candidates_found} Q&A pairs)"
-        )
+        status = f"Chunk {progress.current_chunk}/{progress.total_chunks} ({progress.candidates_found} Q&A pairs)"
+        if progress.duplicate_chunks:
+            status += f", {progress.duplicate_chunks} duplicate chunks reused"
+        self.progress_label.config(text=status)
+        
+        # Show chunk results as soon as they arrive
+        if progress.new_candidates:
+            self.candidates.extend(progress.new_candidates)
+            self.ai_qa_pairs.extend(self._to_qa_pairs(progress.new_candidates))
+            self._append_qa_pairs()
     
     def on_extraction_complete(self, candidates: List[AnswerCandidate]):
         """Handle extraction completion"""
         self.candidates = candidates
+        self.ai_qa_pairs = self._to_qa_pairs(candidates)
+        
+        # Streamed rows are a prefix of the final results unless they were truncated
+        if len(self._item_ids) > len(self.ai_qa_pairs):
+            self.update_results_display()
+        else:
+            self._append_qa_pairs()
         
-        # Extract Q&A pairs
-        self.ai_qa_pairs = []
-        for candidate in candidates:
-            if candidate.extraction_method == 'ai' and candidate.context:
-                self.ai_qa_pairs.append({
-                    'question': candidate.context,
-                    'answer': candidate.text
-                })
-        
-        self.update_results_display()
         self.progress_label.config(text=f"Complete - {len(self.ai_qa_pairs)} Q&A pairs extracted")
         self.reset_extraction_state()
     
@@ -531,21 +682,42 @@ Return only the JSON array, no additional text."""
         self.extract_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
     
+    def _to_qa_pairs(self, candidates: List[AnswerCandidate]) -> List[Dict[str, str]]:
+        """Extract Q&A pairs from AI candidates"""
+        return [
+            {'question': candidate.context, 'answer': candidate.text}
+            for candidate in candidates
+            if candidate.extraction_method == 'ai' and candidate.context
+        ]
+    
     def update_results_display(self):
-        """Update results tree"""
+        """Rebuild the results tree"""
         # Clear existing items
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        self.results_tree.delete(*self._item_ids)
+        self._item_ids = []
+        self._iid_to_index = {}
+        self._answer_previews = []
         
-        # Add Q&A pairs
-        for i, qa_pair in enumerate(self.ai_qa_pairs):
+        self._append_qa_pairs()
+    
+    def _append_qa_pairs(self):
+        """Add tree rows for Q&A pairs not displayed yet"""
+        previews = self._answer_previews
+        for i in range(len(self._item_ids), len(self.ai_qa_pairs)):
+            qa_pair = self.ai_qa_pairs[i]
             checkbox = '☑' if i in self.selected_indices else '☐'
-            answer_preview = qa_pair['answer'][:100] + "..." if len(qa_pair['answer']) > 100 else qa_pair['answer']
             
-            self.results_tree.insert('', 'end',
+            # Previews are kept apart from the pairs, which are handed on to the dataset
+            if i == len(previews):
+                answer = qa_pair['answer']
+                previews.append(answer[:100] + "..." if len(answer) > 100 else answer)
+            
+            item_id = self.results_tree.insert('', 'end',
                 text=checkbox,
-                values=(qa_pair['question'], answer_preview)
+                values=(qa_pair['question'], previews[i])
             )
+            self._item_ids.append(item_id)
+            self._iid_to_index[item_id] = i
         
         self.update_selection_count()
     
@@ -553,8 +725,7 @@ Return only the JSON array, no additional text."""
         """Handle tree click for selection"""
         item = self.results_tree.identify_row(event.y)
         if item:
-            children = self.results_tree.get_children()
-            item_index = children.index(item)
+            item_index = self._iid_to_index[item]
             
             if item_index in self.selected_indices:
                 self.selected_indices.remove(item_index)
@@ -569,8 +740,7 @@ Return only the JSON array, no additional text."""
         """Handle tree double-click to show details"""
         item = self.results_tree.identify_row(event.y)
         if item:
-            children = self.results_tree.get_children()
-            item_index = children.index(item)
+            item_index = self._iid_to_index[item]
             
             if item_index < len(self.ai_qa_pairs):
                 qa_pair = self.ai_qa_pairs[item_index]
@@ -604,18 +774,28 @@ Return only the JSON array, no additional text."""
     
     def select_all(self):
         """Select all Q&A pairs"""
-        for i in range(len(self.ai_qa_pairs)):
-            self.selected_indices.add(i)
-        self.update_results_display()
+        # Only rows that are not selected yet need their checkbox redrawn
+        newly_selected = set(range(len(self._item_ids))).difference(self.selected_indices)
+        for i in newly_selected:
+            self.results_tree.item(self._item_ids[i], text='☑')
+        self.selected_indices.update(newly_selected)
+        self.update_selection_count()
     
     def select_none(self):
         """Deselect all Q&A pairs"""
+        for i in self.selected_indices:
+            if i < len(self._item_ids):
+                self.results_tree.item(self._item_ids[i], text='☐')
         self.selected_indices.clear()
-        self.update_results_display()
+        self.update_selection_count()
     
     def update_selection_count(self):
         """Update selection count label"""
-        self.selection_count_label.config(text=f"{len(self.selected_indices)} selected")
+        # Page changes and repeated bulk selections often leave the count as it was
+        count = len(self.selected_indices)
+        if count != self._shown_selection_count:
+            self._shown_selection_count = count
+            self.selection_count_label.config(text=f"{count} selected")
     
     def add_selected(self):
         """Add selected Q&A pairs"""
@@ -623,11 +803,13 @@ Return only the JSON array, no additional text."""
             messagebox.showwarning("Warning", "No Q&A pairs selected")
             return
         
-        selected_candidates = [self.candidates[i] for i in sorted(self.selected_indices) if i < len(self.candidates)]
-        selected_qa_pairs = [self.ai_qa_pairs[i] for i in sorted(self.selected_indices) if i < len(self.ai_qa_pairs)]
+        selected = sorted(self.selected_indices)
+        selected_candidates = [self.candidates[i] for i in selected if i < len(self.candidates)]
+        selected_qa_pairs = [self.ai_qa_pairs[i] for i in selected if i < len(self.ai_qa_pairs)]
         
         self.result = selected_candidates
         self.ai_qa_pairs = selected_qa_pairs
+        self._session.close()
         self.dialog.destroy()
     
     def cancel(self):
@@ -636,4 +818,5 @@ Return only the JSON array, no additional text."""
             self.stop_extraction()
         
         self.result = None
+        self._session.close()
         self.dialog.destroy()
\ No newline at end of file
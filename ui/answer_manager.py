@@ -3,9 +3,12 @@ Answer management widget for organizing selected text answers
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox
 from typing import List, Callable, Optional, Dict, Any
-from core.answer_extractor import AnswerCandidate
+
+# Line breaks and tabs become spaces in one-line previews
+_PREVIEW_TRANS = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
 
 class AnswerManager:
     """Widget for managing selected answers"""
@@ -14,9 +17,22 @@ class AnswerManager:
         self.parent = parent
         self.modification_callback = modification_callback
         self.answers = []
+        self._previews = []  # One-line listbox previews, parallel to self.answers (None until first shown)
         self.current_document = None
         self.extraction_candidates = []
         self.qa_addition_callback = None  # Callback for adding Q&A pairs from AI extraction
+        self._shown_count = None  # Answer count currently shown in count_label
+        self._modified_after_id = None  # Pending idle call reporting answer changes
+        
+        # The listbox only holds the rows in view, starting at answer _view_start
+        self._view_start = 0
+        self._selected_index = None  # Selected answer index, which may be scrolled out of view
+        self._previewed = (None, None)  # (index, answer) currently shown in the preview
+        self._selection_after_id = None  # Pending preview update for repeated selection events
+        self._drag_direction = 0  # -1/1 while a selection drag is above/below the listbox
+        self._drag_after_id = None  # Pending auto-scroll step of a selection drag
+        self._button_states = {}  # Button widget -> state last configured
+        self._answer_dialog = None  # ManualAnswerDialog, created on first use and reused
         
         self.setup_ui()
     
@@ -87,18 +103,26 @@ class AnswerManager:
         self.list_frame = ttk.Frame(self.frame)
         self.list_frame.pack(fill=tk.BOTH, expand=True)
         
+        # Rows are replaced as a whole through the list variable
+        self._rows_var = tk.Variable(self.list_frame, value=())
         self.listbox = tk.Listbox(
             self.list_frame,
+            listvariable=self._rows_var,
             selectmode=tk.SINGLE,
             font=('Arial', 10)
         )
         
+        # Row height and border as Tk lays out listbox lines
+        font = tkfont.Font(font=self.listbox.cget('font'))
+        self._row_height = font.metrics('linespace') + 1 + 2 * int(self.listbox.cget('selectborderwidth'))
+        self._list_border = 2 * (int(self.listbox.cget('borderwidth')) + int(self.listbox.cget('highlightthickness')))
+        
+        # The scrollbar moves the rendered window over self.answers, not the listbox itself
         self.list_scrollbar = ttk.Scrollbar(
             self.list_frame,
             orient=tk.VERTICAL,
-            command=self.listbox.yview
+            command=self._on_scrollbar
         )
-        self.listbox.configure(yscrollcommand=self.list_scrollbar.set)
         
         # Pack listbox and scrollbar
         self.list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -118,64 +142,89 @@ class AnswerManager:
         self.preview_text.pack(fill=tk.X)
         
         # Bind events
-        self.listbox.bind('<<ListboxSelect>>', self.on_selection_change)
+        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
         self.listbox.bind('<Double-Button-1>', self.edit_selected_answer)
+        self.listbox.bind('<Configure>', lambda e: self.refresh_list())
+        self.listbox.bind('<MouseWheel>', lambda e: self._scroll_rows(-3 if e.delta > 0 else 3))
+        self.listbox.bind('<Button-4>', lambda e: self._scroll_rows(-3))
+        self.listbox.bind('<Button-5>', lambda e: self._scroll_rows(3))
+        self.listbox.bind('<Up>', lambda e: self._move_selection(-1))
+        self.listbox.bind('<Down>', lambda e: self._move_selection(1))
+        self.listbox.bind('<Prior>', lambda e: self._move_selection(-self._visible_rows()))
+        self.listbox.bind('<Next>', lambda e: self._move_selection(self._visible_rows()))
+        self.listbox.bind('<Home>', lambda e: self._jump_selection(0))
+        self.listbox.bind('<End>', lambda e: self._jump_selection(len(self.answers) - 1))
+        self.listbox.bind('<B1-Motion>', self._on_drag)
+        self.listbox.bind('<B1-Leave>', lambda e: 'break')  # Tk's own autoscan cannot see rows outside the window
+        self.listbox.bind('<ButtonRelease-1>', self._stop_drag_scroll)
     
     def add_answer(self, answer_text: str):
         """Add a new answer to the list"""
         if answer_text.strip():
             clean_answer = answer_text.strip()
             self.answers.append(clean_answer)
-            self.refresh_list()
-            self.modification_callback(self.answers)
+            self._previews.append(self._make_preview(clean_answer))
+            self._notify_modified()
             
             # Select the newly added item
-            self.listbox.selection_clear(0, tk.END)
-            self.listbox.selection_set(len(self.answers) - 1)
-            self.listbox.see(len(self.answers) - 1)
-            self.on_selection_change()
+            self._select(len(self.answers) - 1)
+    
+    def add_answers(self, answer_texts: List[str]):
+        """Add several answers with a single list update"""
+        clean_answers = [text.strip() for text in answer_texts if text.strip()]
+        if not clean_answers:
+            return
+        
+        self.answers.extend(clean_answers)
+        self._previews.extend(self._make_preview(answer) for answer in clean_answers)
+        self._notify_modified()
+        
+        # Select the last added item
+        self._select(len(self.answers) - 1)
     
     def add_manual_answer(self):
         """Add answer manually through dialog"""
-        dialog = ManualAnswerDialog(self.parent)
-        if dialog.result:
-            self.add_answer(dialog.result)
+        result = self._ask_answer()
+        if result:
+            self.add_answer(result)
+    
+    def _ask_answer(self, initial_text: str = "") -> Optional[str]:
+        """Show the shared answer dialog and return the entered text"""
+        if self._answer_dialog is None:
+            self._answer_dialog = ManualAnswerDialog(self.parent)
+        return self._answer_dialog.ask(initial_text)
     
     def edit_selected_answer(self, event=None):
         """Edit the selected answer"""
-        selection = self.listbox.curselection()
-        if selection:
-            index = selection[0]
+        if self._selected_index is not None:
+            index = self._selected_index
             current_answer = self.answers[index]
             
-            dialog = ManualAnswerDialog(self.parent, current_answer)
-            if dialog.result:
-                self.answers[index] = dialog.result
-                self.refresh_list()
-                self.modification_callback(self.answers)
+            result = self._ask_answer(current_answer)
+            # OK without changes needs no update or modification callback
+            if result and result != current_answer:
+                self.answers[index] = result
+                self._previews[index] = self._make_preview(result)
+                self._notify_modified()
                 
                 # Maintain selection
-                self.listbox.selection_set(index)
-                self.on_selection_change()
+                self._select(index)
     
     def delete_selected_answer(self):
         """Delete the selected answer"""
-        selection = self.listbox.curselection()
-        if selection:
-            index = selection[0]
+        if self._selected_index is not None:
+            index = self._selected_index
             answer_preview = self.answers[index][:50] + "..." if len(self.answers[index]) > 50 else self.answers[index]
             
             if messagebox.askyesno("Confirm Delete", f"Delete this answer?\n\n{answer_preview}"):
                 del self.answers[index]
+                del self._previews[index]
+                self._selected_index = None
                 self.refresh_list()
-                self.modification_callback(self.answers)
+                self._notify_modified()
                 
-                # Update button states
-                self.edit_btn.config(state=tk.DISABLED)
-                self.delete_btn.config(state=tk.DISABLED)
-                self.preview_text.config(state=tk.NORMAL)
-                self.preview_text.delete(1.0, tk.END)
-                self.preview_text.config(state=tk.DISABLED)
+                # Clear the preview and update button states
+                self.on_selection_change()
     
     def clear_all_answers(self):
         """Clear all answers"""
@@ -185,27 +234,29 @@ class AnswerManager:
     def clear_answers(self):
         """Clear answers without confirmation"""
         self.answers = []
+        self._previews = []
+        self._selected_index = None
         self.refresh_list()
-        self.modification_callback(self.answers)
+        self._notify_modified()
         
         # Update UI state
-        self.edit_btn.config(state=tk.DISABLED)
-        self.delete_btn.config(state=tk.DISABLED)
-        self.preview_text.config(state=tk.NORMAL)
-        self.preview_text.delete(1.0, tk.END)
-        self.preview_text.config(state=tk.DISABLED)
+        self.on_selection_change()
     
     def load_answers(self, answers: List[str]):
         """Load answers from external source"""
-        self.answers = answers[:]
+        self.answers = list(answers)
+        self._previews = [None] * len(self.answers)  # Built as rows scroll into view
+        self._selected_index = None
         self.refresh_list()
-        self.modification_callback(self.answers)
+        self._notify_modified()
+        self.on_selection_change()
     
     def set_current_document(self, document_data: Dict[str, Any]):
         """Set the current document for auto-extraction"""
         self.current_document = document_data
-        self.auto_extract_btn.config(state=tk.NORMAL if document_data else tk.DISABLED)
-        self.ai_extract_btn.config(state=tk.NORMAL if document_data else tk.DISABLED)
+        state = tk.NORMAL if document_data else tk.DISABLED
+        self._set_button_state(self.auto_extract_btn, state)
+        self._set_button_state(self.ai_extract_btn, state)
     
     def set_qa_addition_callback(self, callback: Callable[[List[Dict[str, str]]], None]):
         """Set callback for adding Q&A pairs from AI extraction"""
@@ -223,8 +274,7 @@ class AnswerManager:
         
         if dialog.result:
             # Add selected candidates as answers
-            for candidate in dialog.result:
-                self.add_answer(candidate.text)
+            self.add_answers([candidate.text for candidate in dialog.result])
             
             # Handle AI extraction - add Q&A pairs to question generator
             if hasattr(dialog, 'ai_qa_pairs') and dialog.ai_qa_pairs and self.qa_addition_callback:
@@ -251,8 +301,7 @@ class AnswerManager:
         
         if dialog.result:
             # Add selected candidates as answers
-            for candidate in dialog.result:
-                self.add_answer(candidate.text)
+            self.add_answers([candidate.text for candidate in dialog.result])
             
             # Add Q&A pairs to question generator
             if hasattr(dialog, 'ai_qa_pairs') and dialog.ai_qa_pairs and self.qa_addition_callback:
@@ -275,28 +324,172 @@ class AnswerManager:
             return None
     
     def refresh_list(self):
-        """Refresh the listbox display"""
-        self.listbox.delete(0, tk.END)
-        
-        for i, answer in enumerate(self.answers):
-            # Create preview text (first 60 characters)
-            preview = answer.replace('\n', ' ').replace('\r', ' ')
-            if len(preview) > 60:
-                preview = preview[:57] + "..."
-            
-            display_text = f"{i+1:2d}. {preview}"
-            self.listbox.insert(tk.END, display_text)
+        """Refresh the listbox display with the rows currently in view"""
+        total = len(self.answers)
+        rows = self._visible_rows()
+        self._view_start = max(0, min(self._view_start, total - rows))
+        view_end = min(total, self._view_start + rows)
+        
+        # Replace all rows with a single Tcl list assignment
+        self._rows_var.set(tuple(self._format_row(i) for i in range(self._view_start, view_end)))
+        
+        self.listbox.selection_clear(0, tk.END)
+        if self._selected_index is not None and self._view_start <= self._selected_index < view_end:
+            self.listbox.selection_set(self._selected_index - self._view_start)
+        
+        if total:
+            self.list_scrollbar.set(self._view_start / total, view_end / total)
+        else:
+            self.list_scrollbar.set(0, 1)
+        
+        self.update_count_label()
+    
+    def _visible_rows(self) -> int:
+        """Number of rows that fit in the listbox at its current size"""
+        return max(1, (self.listbox.winfo_height() - self._list_border) // self._row_height)
+    
+    def _on_scrollbar(self, *args):
+        """Move the view in response to the scrollbar"""
+        if args[0] == 'moveto':
+            self._view_start = int(float(args[1]) * len(self.answers))
+            self.refresh_list()
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self._scroll_rows(step * self._visible_rows() if args[2] == 'pages' else step)
+    
+    def _scroll_rows(self, delta: int):
+        self._view_start += delta
+        self.refresh_list()
+        return 'break'  # The listbox only holds visible rows, so skip its own scrolling
+    
+    def _see(self, index: int):
+        """Scroll so answer index is in view"""
+        rows = self._visible_rows()
+        if index < self._view_start:
+            self._view_start = index
+        elif index >= self._view_start + rows:
+            self._view_start = index - rows + 1
+    
+    def _select(self, index: int):
+        """Select answer index, scrolling it into view"""
+        self._selected_index = index
+        self._see(index)
+        self.refresh_list()
+        self.on_selection_change()
+    
+    def _move_selection(self, delta: int):
+        current = self._selected_index if self._selected_index is not None else self._view_start - delta
+        return self._jump_selection(current + delta)
+    
+    def _jump_selection(self, index: int):
+        """Select answer index (clamped to the list) from the keyboard or a drag, scrolling it into view"""
+        if self.answers:
+            self._selected_index = max(0, min(len(self.answers) - 1, index))
+            self._see(self._selected_index)
+            self.refresh_list()
+            self._schedule_selection_update()
+        return 'break'
+    
+    def _on_drag(self, event):
+        """Auto-scroll while a drag is past the top or bottom edge of the listbox"""
+        if event.y < 0:
+            self._drag_direction = -1
+        elif event.y >= self.listbox.winfo_height():
+            self._drag_direction = 1
+        else:
+            # Back inside the listbox: stop scrolling and leave the drag to the default binding
+            self._drag_direction = 0
+            return None
         
-        # Update count
-        self.count_label.config(text=f"{len(self.answers)} answers")
+        if self._drag_after_id is None:
+            self._drag_scroll()
+        return 'break'
+    
+    def _drag_scroll(self):
+        """Scroll the view one row toward the edge being dragged over, repeating until the drag stops"""
+        self._drag_after_id = None
+        if not self._drag_direction:
+            return
+        # Like Tk's autoscan in single-select mode, only the view moves, not the selection
+        self._scroll_rows(self._drag_direction)
+        self._drag_after_id = self.listbox.after(50, self._drag_scroll)
+    
+    def _stop_drag_scroll(self, event=None):
+        self._drag_direction = 0
+        if self._drag_after_id is not None:
+            self.listbox.after_cancel(self._drag_after_id)
+            self._drag_after_id = None
+    
+    def _on_listbox_select(self, event=None):
+        """Track the selected answer from a click on a visible row"""
+        selection = self.listbox.curselection()
+        self._selected_index = self._view_start + selection[0] if selection else None
+        self._schedule_selection_update()
+    
+    def _schedule_selection_update(self):
+        """Update the preview at most every 30ms while selection events repeat (e.g. a held arrow key)"""
+        if self._selection_after_id is None:
+            self._selection_after_id = self.parent.after(30, self._apply_selection_update)
+    
+    def _apply_selection_update(self):
+        self._selection_after_id = None
+        self.on_selection_change()
+    
+    def _format_row(self, i: int) -> str:
+        """Format the listbox row for answer i"""
+        preview = self._previews[i]
+        if preview is None:
+            preview = self._previews[i] = self._make_preview(self.answers[i])
+        return f"{i+1:2d}. {preview}"
+    
+    @staticmethod
+    def _make_preview(answer: str) -> str:
+        """Create preview text (first 60 characters on one line)"""
+        # Translation maps one character to one, so only the part that can be shown is translated
+        preview = answer[:61].translate(_PREVIEW_TRANS)
+        if len(preview) > 60:
+            preview = preview[:57] + "..."
+        return preview
+    
+    def _notify_modified(self):
+        """Report answer changes once Tk is idle, so back-to-back edits trigger one callback"""
+        if self._modified_after_id is None:
+            self._modified_after_id = self.parent.after_idle(self._flush_modified)
+    
+    def _flush_modified(self):
+        self._modified_after_id = None
+        self.modification_callback(self.answers)
+    
+    def flush_modifications(self):
+        """Report pending answer changes right away"""
+        if self._modified_after_id is not None:
+            self.parent.after_cancel(self._modified_after_id)
+            self._flush_modified()
+    
+    def _set_button_state(self, button: ttk.Button, state: str):
+        """Configure a button's state only when it actually changes"""
+        if self._button_states.get(button) != state:
+            self._button_states[button] = state
+            button.config(state=state)
+    
+    def update_count_label(self):
+        """Update the answer count, skipping the Tk call when it is unchanged"""
+        if len(self.answers) != self._shown_count:
+            self._shown_count = len(self.answers)
+            self.count_label.config(text=f"{self._shown_count} answers")
     
     def on_selection_change(self, event=None):
         """Handle listbox selection change"""
-        selection = self.listbox.curselection()
-        if selection:
-            index = selection[0]
-            answer = self.answers[index]
-            
+        index = self._selected_index
+        answer = self.answers[index] if index is not None else None
+        
+        # Repeated events for the same answer need no redraw; an edit replaces the answer object
+        previewed_index, previewed_answer = self._previewed
+        if index == previewed_index and answer is previewed_answer:
+            return
+        self._previewed = (index, answer)
+        
+        if answer is not None:
             # Update preview
             self.preview_text.config(state=tk.NORMAL)
             self.preview_text.delete(1.0, tk.END)
@@ -304,40 +497,44 @@ class AnswerManager:
             self.preview_text.config(state=tk.DISABLED)
             
             # Enable buttons
-            self.edit_btn.config(state=tk.NORMAL)
-            self.delete_btn.config(state=tk.NORMAL)
+            self._set_button_state(self.edit_btn, tk.NORMAL)
+            self._set_button_state(self.delete_btn, tk.NORMAL)
         else:
             # Clear preview and disable buttons
             self.preview_text.config(state=tk.NORMAL)
             self.preview_text.delete(1.0, tk.END)
             self.preview_text.config(state=tk.DISABLED)
             
-            self.edit_btn.config(state=tk.DISABLED)
-            self.delete_btn.config(state=tk.DISABLED)
+            self._set_button_state(self.edit_btn, tk.DISABLED)
+            self._set_button_state(self.delete_btn, tk.DISABLED)
 
 class ManualAnswerDialog:
-    """Dialog for manually entering/editing answers"""
+    """Dialog for manually entering/editing answers, hidden and reused between uses"""
     
-    def __init__(self, parent: tk.Widget, initial_text: str = ""):
+    def __init__(self, parent: tk.Widget):
         self.parent = parent
         self.result = None
-        self.initial_text = initial_text
-        
-        self.create_dialog()
+        self.dialog = None
+    
+    def ask(self, initial_text: str = "") -> Optional[str]:
+        """Show the dialog modally and return the entered text (None if cancelled)"""
+        if self.dialog is None or not self.dialog.winfo_exists():
+            self.create_dialog()
+        
+        self.configure(initial_text)
+        self.show_modal()
+        return self.result
     
     def create_dialog(self):
-        """Create the dialog window"""
+        """Create the dialog window (initially hidden)"""
         self.dialog = tk.Toplevel(self.parent)
-        self.dialog.title("Enter Answer" if not self.initial_text else "Edit Answer")
+        self.dialog.withdraw()
         self.dialog.geometry("500x300")
         self.dialog.transient(self.parent)
-        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
-        # Center the dialog
-        self.dialog.geometry("+%d+%d" % (
-            self.parent.winfo_rootx() + 50,
-            self.parent.winfo_rooty() + 50
-        ))
+        # Set by OK/Cancel to end the modal wait
+        self.done_var = tk.BooleanVar(self.dialog, value=False)
         
         # Main frame
         main_frame = ttk.Frame(self.dialog, padding=10)
@@ -366,12 +563,6 @@ class ManualAnswerDialog:
         text_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Insert initial text
-        if self.initial_text:
-            self.text_widget.insert(1.0, self.initial_text)
-            self.text_widget.focus_set()
-            self.text_widget.mark_set(tk.INSERT, tk.END)
-        
         # Button frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
@@ -383,21 +574,45 @@ class ManualAnswerDialog:
         # Bind events
         self.dialog.bind('<Return>', lambda e: self.ok())
         self.dialog.bind('<Escape>', lambda e: self.cancel())
+    
+    def configure(self, initial_text: str = ""):
+        """Reset the dialog for a new answer or for editing initial_text"""
+        self.result = None
+        self.done_var.set(False)
+        self.dialog.title("Enter Answer" if not initial_text else "Edit Answer")
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (
+            self.parent.winfo_rootx() + 50,
+            self.parent.winfo_rooty() + 50
+        ))
+        
+        self.text_widget.delete(1.0, tk.END)
+        if initial_text:
+            self.text_widget.insert(1.0, initial_text)
+            self.text_widget.mark_set(tk.INSERT, tk.END)
+    
+    def show_modal(self):
+        """Show the dialog and wait until OK or Cancel, then hide it again"""
+        self.dialog.deiconify()
+        self.dialog.grab_set()
         
         # Focus on text widget
         self.text_widget.focus_set()
         
-        # Wait for dialog to close
-        self.dialog.wait_window()
+        self.dialog.wait_variable(self.done_var)
+        
+        self.dialog.grab_release()
+        self.dialog.withdraw()
     
     def ok(self):
         """Handle OK button"""
         text = self.text_widget.get(1.0, tk.END).strip()
         if text:
             self.result = text
-        self.dialog.destroy()
+        self.done_var.set(True)
     
     def cancel(self):
         """Handle Cancel button"""
         self.result = None
-        self.dialog.destroy()
\ No newline at end of file
+        self.done_var.set(True)
\ No newline at end of file
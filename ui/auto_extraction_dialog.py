@@ -6,11 +6,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, Any, List, Optional
 import threading
+import queue
 import time
 import sys,os
 
 from core.answer_extractor import AnswerExtractor, AnswerCandidate, ExtractionProgress
 
+# Line breaks and tabs become spaces in one-line previews
+_PREVIEW_TRANS = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
 class AutoExtractionDialog:
     """Optimized auto-extraction dialog for large documents"""
     
@@ -21,6 +25,8 @@ class AutoExtractionDialog:
         self.candidates = []
         self.displayed_candidates = []  # Subset currently displayed
         self.selected_indices = set()
+        self.high_confidence_indices = set()  # Filled once per extraction result
+        self._row_values = []  # Tree values per candidate, formatted off the Tk thread
         
         # Optimized extractor
         self.extractor = AnswerExtractor()
@@ -33,12 +39,21 @@ class AutoExtractionDialog:
         # Extraction state
         self.extraction_thread = None
         self.is_extracting = False
+        self.extraction_key = None  # Settings of the running extraction
+        self.completed_key = None  # Settings that produced self.candidates
+        
+        # Filled by the extraction relay thread, drained on the Tk thread by _drain_ui_queue
+        self._progress_queue = queue.Queue()  # Progress snapshots; only the latest is shown
+        self._ui_queue = queue.Queue()  # (callback, args) to run on the Tk thread
+        
+        self.detail_window = None  # Candidate details window, created on first use
         
         self.create_dialog()
     
     def create_dialog(self):
         """Create the optimized auto-extraction dialog"""
         self.dialog = tk.Toplevel(self.parent)
+        self.dialog.withdraw()  # Build hidden so layout is computed once when shown
         self.dialog.title("Auto Extract Answers")
 
         # Get dialog dimensions
@@ -47,11 +62,8 @@ class AutoExtractionDialog:
 
         self.dialog.minsize(dialog_width, dialog_height)  # Set minimum size to ensure critical elements are visible
         self.dialog.transient(self.parent)
-        self.dialog.grab_set()
         
         # Center the dialog on screen
-        self.dialog.update_idletasks()  # Ensure geometry is calculated
-        
         # Get screen dimensions
         screen_width = self.dialog.winfo_screenwidth()
         screen_height = self.dialog.winfo_screenheight()
@@ -98,8 +110,16 @@ class AutoExtractionDialog:
         self.dialog.bind('<Escape>', lambda e: self.cancel())
         self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
+        # Start running progress and callbacks queued by the extraction thread
+        self._drain_ui_queue()
+        
         # Remove the extraction estimate popup
         
+        # Show the finished dialog; the grab needs a viewable window
+        self.dialog.update_idletasks()
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        
         # Wait for dialog to close
         self.dialog.wait_window()
     
@@ -205,8 +225,8 @@ class AutoExtractionDialog:
         ttk.Entry(filter_row2, textvariable=self.max_candidates_var, width=8).pack(side=tk.LEFT, padx=(5, 0))
         
         # Extract button
-        extract_btn = ttk.Button(options_frame, text="Start Extraction", command=self.start_extraction)
-        extract_btn.pack(pady=(3, 0))
+        self.extract_btn = ttk.Button(options_frame, text="Start Extraction", command=self.start_extraction)
+        self.extract_btn.pack(pady=(3, 0))
     
     
     def create_progress_section(self, parent):
@@ -286,6 +306,7 @@ class AutoExtractionDialog:
         
         self.selection_count_label = ttk.Label(selection_controls, text="0 selected")
         self.selection_count_label.pack(side=tk.LEFT, padx=(10, 0))
+        self._shown_selection_count = 0
         
         # Results list
         list_frame = ttk.Frame(results_frame)
@@ -314,6 +335,11 @@ class AutoExtractionDialog:
         tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.candidates_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
+        # Pool of tree rows reused across pages; row k shows the k-th candidate of the page
+        self._row_ids = []
+        self._row_offsets = {}  # Row iid -> offset within the page
+        self._attached_rows = 0
+        
         # Bind events
         self.candidates_tree.bind('<Button-1>', self.on_tree_click)
         self.candidates_tree.bind('<Double-Button-1>', self.on_tree_double_click)
@@ -341,23 +367,32 @@ class AutoExtractionDialog:
                 messagebox.showwarning("Warning", "Please select at least one extraction method")
                 return
             
+            # Same settings on the same document would produce the same candidates
+            extraction_key = (min_length, max_length, min_confidence, max_candidates, tuple(selected_methods))
+            if extraction_key == self.completed_key:
+                self.progress_label.config(text=f"Settings unchanged - {len(self.candidates)} candidates found")
+                return
+            self.extraction_key = extraction_key
             
             # Show progress section (it's now already in the bottom frame)
             self.progress_frame.pack(fill=tk.X, pady=(0, 5))
             
             # Start extraction
             self.is_extracting = True
+            self.extract_btn.config(state=tk.DISABLED)
             self.stop_btn.config(state=tk.NORMAL)
             self.candidates = []
+            self.completed_key = None
             self.selected_indices.clear()
+            self.high_confidence_indices = set()
             
             # Start threaded extraction
             self.extraction_thread = self.extractor.extract_answers_threaded(
                 self.document_data,
                 methods=selected_methods,
-                progress_callback=self.on_extraction_progress,
-                completion_callback=self.on_extraction_complete,
-                error_callback=self.on_extraction_error,
+                progress_callback=self._queue_progress,
+                completion_callback=self._prepare_results,
+                error_callback=lambda error: self._call_in_ui(self.on_extraction_error, error),
                 max_candidates=max_candidates
             )
             
@@ -365,6 +400,72 @@ class AutoExtractionDialog:
             messagebox.showerror("Error", f"Invalid settings: {str(e)}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start extraction: {str(e)}")
+            self.reset_extraction_state()
+    
+    def _call_in_ui(self, func, *args):
+        """Queue a callback from the extraction thread to run on the Tk main loop"""
+        # Only the queue is touched here; Tk is not safe to call from other threads
+        self._ui_queue.put((func, args))
+    
+    def _drain_ui_queue(self):
+        """Show the latest progress and run queued callbacks, then poll again (Tk thread only)"""
+        if not self.dialog.winfo_exists():
+            return  # Dialog closed; late callbacks are dropped
+        
+        try:
+            self._flush_progress()
+            while True:
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.dialog.after(50, self._drain_ui_queue)  # Keep polling even if a callback failed
+    
+    def _prepare_results(self, candidates: List[AnswerCandidate]):
+        """Format tree values and high-confidence indices on the extraction thread"""
+        high_confidence_indices = {i for i, c in enumerate(candidates) if c.confidence > 0.7}
+        row_values = [self._format_values(c) for c in candidates]
+        self._call_in_ui(self.on_extraction_complete, candidates, high_confidence_indices, row_values)
+    
+    @staticmethod
+    def _format_values(candidate: AnswerCandidate) -> tuple:
+        """Tree column values for a candidate"""
+        preview = candidate.text[:151].translate(_PREVIEW_TRANS)
+        if len(preview) > 150:
+            preview = preview[:150] + "..."
+        return (
+            candidate.extraction_method,
+            f"{candidate.confidence:.2f}",
+            str(len(candidate.text)),
+            preview
+        )
+    
+    def _queue_progress(self, progress: ExtractionProgress):
+        """Queue progress from the extraction thread; the UI poll shows the latest every 50ms"""
+        if progress.error_message:
+            self._call_in_ui(self.on_extraction_error, progress.error_message)
+            return
+        
+        self._progress_queue.put(progress)
+    
+    def _flush_progress(self):
+        """Show the newest queued progress, dropping the superseded ones"""
+        progress = None
+        while True:
+            try:
+                progress = self._progress_queue.get_nowait()
+            except queue.Empty:
+                break
+        if progress is not None:
+            self.on_extraction_progress(progress)
+    
+    def reset_extraction_state(self):
+        """Reset extraction UI state"""
+        self.is_extracting = False
+        self.extract_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
     
     def on_extraction_progress(self, progress: ExtractionProgress):
         """Handle extraction progress updates"""
@@ -383,30 +484,33 @@ class AutoExtractionDialog:
         )
         
         if progress.is_complete:
-            self.is_extracting = False
-            self.stop_btn.config(state=tk.DISABLED)
+            self.reset_extraction_state()
     
-    def on_extraction_complete(self, candidates: List[AnswerCandidate]):
+    def on_extraction_complete(self, candidates: List[AnswerCandidate],
+                               high_confidence_indices: set, row_values: List[tuple]):
         """Handle extraction completion"""
+        self._flush_progress()  # Show the final progress before the completion status
         self.candidates = candidates
+        self.high_confidence_indices = high_confidence_indices
+        self._row_values = row_values
         
         self.update_results_display()
         
         # Check if extraction was stopped early
         was_stopped = self.extractor.stop_extraction
         if was_stopped:
+            self.completed_key = None
             self.progress_label.config(text=f"Stopped - {len(candidates)} candidates found (partial results)")
         else:
+            self.completed_key = self.extraction_key
             self.progress_label.config(text=f"Complete - {len(candidates)} candidates found")
         
-        self.is_extracting = False
-        self.stop_btn.config(state=tk.DISABLED)
+        self.reset_extraction_state()
     
     def on_extraction_error(self, error_message: str):
         """Handle extraction error"""
         messagebox.showerror("Extraction Error", f"Extraction failed: {error_message}")
-        self.is_extracting = False
-        self.stop_btn.config(state=tk.DISABLED)
+        self.reset_extraction_state()
         self.progress_label.config(text="Extraction failed")
     
     def stop_extraction(self):
@@ -438,31 +542,40 @@ class AutoExtractionDialog:
     
     def update_candidates_tree(self):
         """Update the candidates tree view"""
-        # Clear existing items
-        for item in self.candidates_tree.get_children():
-            self.candidates_tree.delete(item)
-        
-        # Add candidates for current page
         start_idx = self.current_page * self.items_per_page
         
-        for i, candidate in enumerate(self.displayed_candidates):
-            global_idx = start_idx + i
-            preview = candidate.text[:150] + "..." if len(candidate.text) > 150 else candidate.text
-            preview = preview.replace('\n', ' ').replace('\r', ' ')
-            
+        # Build row values before touching the widget
+        rows = []
+        for i in range(start_idx, start_idx + len(self.displayed_candidates)):
             # Check if this candidate is selected
-            checkbox = '☑' if global_idx in self.selected_indices else '☐'
+            checkbox = '☑' if i in self.selected_indices else '☐'
+            rows.append((checkbox, self._row_values[i]))
+        
+        # Unmap the tree during the bulk update so it is laid out once
+        self.candidates_tree.pack_forget()
+        try:
+            # Grow the row pool to the largest page seen so far
+            while len(self._row_ids) < len(rows):
+                row_id = self.candidates_tree.insert('', 'end', tags=('candidate',))
+                self._row_offsets[row_id] = len(self._row_ids)
+                self._row_ids.append(row_id)
+                self._attached_rows += 1
             
-            item_id = self.candidates_tree.insert('', 'end',
-                text=checkbox,
-                values=(
-                    candidate.extraction_method,
-                    f"{candidate.confidence:.2f}",
-                    str(len(candidate.text)),
-                    preview
-                ),
-                tags=('candidate',)
-            )
+            # Rewrite pooled rows in place instead of deleting and re-inserting them
+            item = self.candidates_tree.item
+            for row_id, (checkbox, values) in zip(self._row_ids, rows):
+                item(row_id, text=checkbox, values=values)
+            
+            # Hide rows a short last page doesn't use, and bring them back later
+            if self._attached_rows > len(rows):
+                self.candidates_tree.detach(*self._row_ids[len(rows):self._attached_rows])
+            for offset in range(self._attached_rows, len(rows)):
+                self.candidates_tree.move(self._row_ids[offset], '', offset)
+            self._attached_rows = len(rows)
+            
+            self.candidates_tree.yview_moveto(0)
+        finally:
+            self.candidates_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         self.update_selection_count()
     
@@ -489,10 +602,7 @@ class AutoExtractionDialog:
         """Handle tree click for checkbox functionality"""
         item = self.candidates_tree.identify_row(event.y)
         if item:
-            # Get the index of the clicked item
-            tree_children = self.candidates_tree.get_children()
-            item_index = tree_children.index(item)
-            global_index = self.current_page * self.items_per_page + item_index
+            global_index = self.current_page * self.items_per_page + self._row_offsets[item]
             
             # Toggle selection
             if global_index in self.selected_indices:
@@ -508,22 +618,15 @@ class AutoExtractionDialog:
         """Handle tree double-click to show full text"""
         item = self.candidates_tree.identify_row(event.y)
         if item:
-            tree_children = self.candidates_tree.get_children()
-            item_index = tree_children.index(item)
+            global_index = self.current_page * self.items_per_page + self._row_offsets[item]
             
-            if item_index < len(self.displayed_candidates):
-                candidate = self.displayed_candidates[item_index]
-                self.show_candidate_details(candidate)
+            if global_index < len(self.candidates):
+                self.show_candidate_details(self.candidates[global_index])
     
     def show_candidate_details(self, candidate: AnswerCandidate):
         """Show full details of a candidate"""
-        detail_window = tk.Toplevel(self.dialog)
-        detail_window.title("Candidate Details")
-        detail_window.geometry("600x500")
-        detail_window.transient(self.dialog)
-        
-        frame = ttk.Frame(detail_window, padding=10)
-        frame.pack(fill=tk.BOTH, expand=True)
+        if self.detail_window is None:
+            self.create_detail_window()
         
         # Info
         info_text = f"Method: {candidate.extraction_method}\n"
@@ -536,16 +639,38 @@ class AutoExtractionDialog:
         
         info_text += "\n"
         
-        ttk.Label(frame, text=info_text, font=('Arial', 10)).pack(anchor=tk.W)
+        self.detail_info_label.config(text=info_text)
         
         # Full text
+        self.detail_text.config(state=tk.NORMAL)
+        self.detail_text.delete(1.0, tk.END)
+        self.detail_text.insert(1.0, candidate.text)
+        self.detail_text.yview_moveto(0)
+        self.detail_text.config(state=tk.DISABLED)
+        
+        self.detail_window.deiconify()
+        self.detail_window.lift()
+    
+    def create_detail_window(self):
+        """Create the candidate details window, reused for every candidate"""
+        self.detail_window = tk.Toplevel(self.dialog)
+        self.detail_window.withdraw()
+        self.detail_window.title("Candidate Details")
+        self.detail_window.geometry("600x500")
+        self.detail_window.transient(self.dialog)
+        self.detail_window.protocol("WM_DELETE_WINDOW", self.detail_window.withdraw)
+        
+        frame = ttk.Frame(self.detail_window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.detail_info_label = ttk.Label(frame, font=('Arial', 10))
+        self.detail_info_label.pack(anchor=tk.W)
+        
         ttk.Label(frame, text="Answer Text:", font=('Arial', 10, 'bold')).pack(anchor=tk.W)
-        text_widget = tk.Text(frame, wrap=tk.WORD, font=('Arial', 11), height=15)
-        text_widget.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
-        text_widget.insert(1.0, candidate.text)
-        text_widget.config(state=tk.DISABLED)
+        self.detail_text = tk.Text(frame, wrap=tk.WORD, font=('Arial', 11), height=15)
+        self.detail_text.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
         
-        ttk.Button(frame, text="Close", command=detail_window.destroy).pack(pady=(5, 0))
+        ttk.Button(frame, text="Close", command=self.detail_window.withdraw).pack(pady=(5, 0))
     
     def select_all(self):
         """Select all candidates (across all pages)"""
@@ -559,33 +684,42 @@ class AutoExtractionDialog:
             ):
                 return
         
-        for i in range(total_candidates):
-            self.selected_indices.add(i)
-        self.update_candidates_tree()
+        self.selected_indices.update(range(total_candidates))
+        self.refresh_checkboxes()
     
     def select_page(self):
         """Select all candidates on current page"""
         start_idx = self.current_page * self.items_per_page
-        for i in range(len(self.displayed_candidates)):
-            self.selected_indices.add(start_idx + i)
-        self.update_candidates_tree()
+        self.selected_indices.update(range(start_idx, start_idx + len(self.displayed_candidates)))
+        self.refresh_checkboxes()
     
     def select_none(self):
         """Deselect all candidates"""
         self.selected_indices.clear()
-        self.update_candidates_tree()
+        self.refresh_checkboxes()
     
     def select_high_confidence(self):
         """Select only high confidence candidates"""
-        self.selected_indices.clear()
-        for i, candidate in enumerate(self.candidates):
-            if candidate.confidence > 0.7:
-                self.selected_indices.add(i)
-        self.update_candidates_tree()
+        self.selected_indices = set(self.high_confidence_indices)
+        self.refresh_checkboxes()
+    
+    def refresh_checkboxes(self):
+        """Sync checkbox marks on the current page with selected_indices"""
+        # selected_indices is the source of truth; only the mark text is rewritten
+        start_idx = self.current_page * self.items_per_page
+        for offset, row_id in enumerate(self._row_ids[:self._attached_rows]):
+            checkbox = '☑' if start_idx + offset in self.selected_indices else '☐'
+            self.candidates_tree.item(row_id, text=checkbox)
+        
+        self.update_selection_count()
     
     def update_selection_count(self):
         """Update the selection count label"""
-        self.selection_count_label.config(text=f"{len(self.selected_indices)} selected")
+        # Page changes and repeated bulk selections often leave the count as it was
+        count = len(self.selected_indices)
+        if count != self._shown_selection_count:
+            self._shown_selection_count = count
+            self.selection_count_label.config(text=f"{count} selected")
     
     def add_selected(self):
         """Add selected candidates to answers"""
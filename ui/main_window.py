@@ -131,7 +131,7 @@ class MainWindow:
         if file_path:
             try:
                 self.status_var.set("Loading document...")
-                self.root.update()
+                self.root.update_idletasks()
                 
                 if not self.document_parser.is_supported(file_path):
                     messagebox.showerror("Error", "Unsupported file format")
@@ -141,14 +141,17 @@ class MainWindow:
                 file_size = os.path.getsize(file_path)
                 
                 self.status_var.set("Loading large document (optimized mode)...")
-                self.root.update()
+                self.root.update_idletasks()
                 
-                # Use optimized parser with progress callback
+                # Use optimized parser with progress callback; redraw only when the shown percentage changes
+                last_shown = [None]
                 def progress_callback(current, total):
                     if total > 0:
-                        progress = (current / total) * 100
-                        self.status_var.set(f"Loading document... {progress:.0f}%")
-                        self.root.update()
+                        progress = round((current / total) * 100)
+                        if progress != last_shown[0]:
+                            last_shown[0] = progress
+                            self.status_var.set(f"Loading document... {progress}%")
+                            self.root.update_idletasks()
                 
                 self.current_document = self.document_parser.parse_document_lazy(
                     file_path, progress_callback
@@ -171,6 +174,7 @@ class MainWindow:
         """Handle text selection from document viewer"""
         if selected_text.strip():
             self.answer_manager.add_answer(selected_text.strip())
+            self.answer_manager.flush_modifications()
             self.status_var.set(f"Added answer ({len(selected_text.strip())} characters)")
     
     def on_answer_modified(self, answers: List[str]):
@@ -230,6 +234,7 @@ class MainWindow:
                 if 'answers' in data:
                     self.answers = data['answers']
                     self.answer_manager.load_answers(self.answers)
+                    self.answer_manager.flush_modifications()
                 else:
                     self.answers = []
                 
@@ -290,6 +295,7 @@ class MainWindow:
         if messagebox.askyesno("Confirm", "Clear all answers?"):
             self.answers = []
             self.answer_manager.clear_answers()
+            self.answer_manager.flush_modifications()
             self.status_var.set("Answers cleared")
     
     def clear_qa_pairs(self):
@@ -8,7 +8,8 @@ import threading
 from typing import List, Dict, Callable, Optional
 import json
 
-from core.llm_client import LLMClient, APIConfig
+# The LLM client (and requests) loads on the first API call, not at startup
+from core.llm_providers import APIConfig, get_available_providers, get_default_model, get_base_url
 
 class QuestionGenerator:
     """Widget for generating questions from answers using LLM APIs"""
@@ -44,7 +45,7 @@ class QuestionGenerator:
         self.provider_combo = ttk.Combobox(
             provider_frame,
             textvariable=self.provider_var,
-            values=LLMClient.get_available_providers(),
+            values=get_available_providers(),
             state="readonly",
             width=15
         )
@@ -195,7 +196,7 @@ class QuestionGenerator:
     def on_provider_change(self, event=None):
         """Handle provider selection change"""
         provider = self.provider_var.get()
-        default_model = LLMClient.get_default_model(provider)
+        default_model = get_default_model(provider)
         self.model_var.set(default_model)
     
     def test_api_connection(self):
@@ -205,12 +206,13 @@ class QuestionGenerator:
             return
         
         try:
+            from core.llm_client import LLMClient
             config = self.create_api_config()
             client = LLMClient(config)
             
             # Test with a simple question
             self.test_btn.config(text="Testing...", state=tk.DISABLED)
-            self.parent.update()
+            self.parent.update_idletasks()
             
             if client.test_connection():
                 messagebox.showinfo("Success", "API connection successful!")
@@ -232,7 +234,7 @@ class QuestionGenerator:
         return APIConfig(
             provider=provider,
             api_key=self.api_key_var.get().strip(),
-            base_url=LLMClient.get_base_url(provider),
+            base_url=get_base_url(provider),
             model=self.model_var.get().strip(),
             max_tokens=500,
             temperature=0.7
@@ -313,6 +315,7 @@ class QuestionGenerator:
                 return
             
             try:
+                from core.llm_client import LLMClient
                 config = self.create_api_config()
                 self.llm_client = LLMClient(config)
                 self.api_config = config